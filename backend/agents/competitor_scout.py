@@ -12,12 +12,14 @@ Returns BOTH a final JSON summary AND the raw documents for RAG.
 
 import json
 import asyncio
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from google.genai import types
 from infra.genai_client import GenAIClient
+from core.llm import gemini_slot
 from app.config import settings
 from core.utils import scrape_url, web_search
 from core.types import Document
@@ -146,9 +148,10 @@ class CompetitorScoutAgent:
             logger.info("🤔 [CompetitorScout] Generating analysis...")
             
             # Prepare context from collected docs
-            context_text = ""
-            for doc in collected_documents:
-                context_text += f"Source: {doc.metadata.get('source')}\nContent: {doc.page_content[:2000]}\n\n"
+            context_text = "".join(
+                f"Source: {doc.metadata.get('source')}\nContent: {doc.page_content[:2000]}\n\n"
+                for doc in collected_documents
+            )
 
             prompt = f"""
             Analyze the following competitor data for the startup idea: "{description}"
@@ -160,16 +163,17 @@ class CompetitorScoutAgent:
             Return the result as a JSON object matching the `CompetitorList` schema.
             """
 
-            response = await self.client.aio.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=CompetitorList,
-                    temperature=0.3,
-                    max_output_tokens=2048,
+            async with gemini_slot():
+                response = await self.client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        response_schema=CompetitorList,
+                        temperature=0.3,
+                        max_output_tokens=2048,
+                    )
                 )
-            )
 
             final_json = response.parsed
             
@@ -187,7 +191,7 @@ class CompetitorScoutAgent:
             return {
                 "success": True,
                 "output_summary": competitors_list,
-                "output_raw_docs": [d.dict() if hasattr(d, 'dict') else d for d in collected_documents], # Ensure serializable
+                "output_raw_docs": collected_documents,
                 "output_type": "CompetitorAnalysisReport",
                 "meta": {"source": "GenAI+Native", "agent": "CompetitorScout"},
             }
@@ -197,9 +201,15 @@ class CompetitorScoutAgent:
             return {"success": False, "error": str(e)}
 
 
+@lru_cache(maxsize=1)
+def _competitor_scout() -> CompetitorScoutAgent:
+    """Shared agent, built on first use; it holds no per-run state."""
+    return CompetitorScoutAgent()
+
+
 # Wrapper function to maintain interface with graph
 async def competitor_scout_agent(query: str) -> Dict[str, Any]:
-    agent = CompetitorScoutAgent()
+    agent = _competitor_scout()
     task = {"description": query}
     state = {"intent": {"idea": query}}
     return await agent.run(task, state)
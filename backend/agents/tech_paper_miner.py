@@ -15,12 +15,14 @@ Returns BOTH a final JSON summary AND the raw documents for RAG.
 import json
 import asyncio
 import arxiv
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from google.genai import types
 from infra.genai_client import GenAIClient
+from core.llm import gemini_slot
 from app.config import settings
 from core.utils import scrape_url, web_search
 from core.types import Document
@@ -93,6 +95,24 @@ class TechPaperMinerAgent:
         except Exception as e:
             return f"Failed to scrape {url}: {e}"
 
+    async def _discover_and_scrape(self, query: str) -> Tuple[str, List[Tuple[str, str]]]:
+        """Runs the Tavily search, then scrapes its top non-PDF links concurrently."""
+        tavily_results_json = await self._tavily_search(query)
+
+        urls_to_scrape = []
+        try:
+            tavily_data = json.loads(tavily_results_json)
+            if isinstance(tavily_data, list):
+                for item in tavily_data[:2]: # Limit to top 2 non-PDF links
+                    url = item.get("url", "")
+                    if url and not url.endswith(".pdf"):
+                        urls_to_scrape.append(url)
+        except Exception:
+            pass
+
+        scrape_results = await asyncio.gather(*(self._scrape_website(url) for url in urls_to_scrape))
+        return tavily_results_json, list(zip(urls_to_scrape, scrape_results))
+
     def _parse_results_to_documents(self, tool_name: str, tool_args: dict, tool_result_string: str) -> List[Document]:
         """Converts the raw JSON/text output from tools into a list of Document objects."""
         documents = []
@@ -150,49 +170,36 @@ class TechPaperMinerAgent:
         try:
             collected_documents = []
 
-            # PHASE 1: BROAD DISCOVERY (Tavily)
-            logger.info("🌍 [TechPaperMiner] Phase 1: Broad Discovery (Tavily)")
+            # PHASE 1: BROAD DISCOVERY (Tavily) -> PHASE 3: SCRAPE DETAILS
+            # PHASE 2: ACADEMIC SEARCH (arXiv)
+            # Only the scrape depends on Tavily, so it starts as soon as Tavily
+            # returns instead of waiting for arXiv. The arxiv client is blocking
+            # (HTTP + rate-limit sleeps), so it runs in a worker thread.
+            logger.info("🌍 [TechPaperMiner] Phases 1-3: Broad Discovery (Tavily) + Scrape, Academic Search (arXiv)")
             tavily_query = f"latest research papers and technical blogs about {research_task_description}"
-            tavily_results_json = await self._tavily_search(tavily_query)
+            arxiv_query = research_task_description[:300] # arXiv query length limit safety
+            (tavily_results_json, scraped), arxiv_results_json = await asyncio.gather(
+                self._discover_and_scrape(tavily_query),
+                asyncio.to_thread(self._arxiv_search, arxiv_query),
+            )
             collected_documents.extend(
                 self._parse_results_to_documents("tavily_search", {"query": tavily_query}, tavily_results_json)
             )
-
-            # PHASE 2: ACADEMIC SEARCH (arXiv)
-            logger.info("📚 [TechPaperMiner] Phase 2: Academic Search (arXiv)")
-            arxiv_query = research_task_description[:300] # arXiv query length limit safety
-            arxiv_results_json = self._arxiv_search(arxiv_query)
             collected_documents.extend(
                 self._parse_results_to_documents("arxiv_search", {"query": arxiv_query}, arxiv_results_json)
             )
-
-            # PHASE 3: SCRAPE DETAILS (from Tavily results)
-            logger.info("🕷️ [TechPaperMiner] Phase 3: Scrape Details")
-            urls_to_scrape = []
-            try:
-                tavily_data = json.loads(tavily_results_json)
-                if isinstance(tavily_data, list):
-                    for item in tavily_data[:2]: # Limit to top 2 non-PDF links
-                        url = item.get("url", "")
-                        if url and not url.endswith(".pdf"):
-                            urls_to_scrape.append(url)
-            except Exception:
-                pass
-
-            if urls_to_scrape:
-                scrape_tasks = [self._scrape_website(url) for url in urls_to_scrape]
-                scrape_results = await asyncio.gather(*scrape_tasks)
-                for url, res in zip(urls_to_scrape, scrape_results):
-                    collected_documents.extend(
-                        self._parse_results_to_documents("scrape_website", {"url": url}, res)
-                    )
+            for url, res in scraped:
+                collected_documents.extend(
+                    self._parse_results_to_documents("scrape_website", {"url": url}, res)
+                )
 
             # PHASE 4: SUMMARIZE (LLM)
             logger.info("📝 [TechPaperMiner] Phase 4: Summarize")
             
-            context_text = ""
-            for doc in collected_documents:
-                context_text += f"Source: {doc.metadata.get('source')}\nTitle: {doc.metadata.get('title')}\nContent: {doc.page_content[:1500]}\n\n"
+            context_text = "".join(
+                f"Source: {doc.metadata.get('source')}\nTitle: {doc.metadata.get('title')}\nContent: {doc.page_content[:1500]}\n\n"
+                for doc in collected_documents
+            )
 
             prompt = f"""
             You are an AI research assistant. Your goal is to find key technical papers, articles, and libraries related to:
@@ -206,16 +213,17 @@ class TechPaperMinerAgent:
             Return the result as a JSON object matching the `PaperList` schema.
             """
 
-            response = await self.client.aio.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=PaperList,
-                    temperature=0.3,
-                    max_output_tokens=2048,
+            async with gemini_slot():
+                response = await self.client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        response_schema=PaperList,
+                        temperature=0.3,
+                        max_output_tokens=2048,
+                    )
                 )
-            )
 
             final_json = response.parsed
             
@@ -231,7 +239,7 @@ class TechPaperMinerAgent:
             return {
                 "success": True,
                 "output_summary": final_summary_list,
-                "output_raw_docs": [d.dict() if hasattr(d, 'dict') else d for d in collected_documents],
+                "output_raw_docs": collected_documents,
                 "output_type": "PaperReport",
                 "meta": {"source": "GenAI+Native", "agent": "TechPaperMiner"},
             }
@@ -241,9 +249,15 @@ class TechPaperMinerAgent:
             return {"success": False, "error": str(e)}
 
 
+@lru_cache(maxsize=1)
+def _tech_paper_miner() -> TechPaperMinerAgent:
+    """Shared agent, built on first use; it holds no per-run state."""
+    return TechPaperMinerAgent()
+
+
 # Wrapper function to maintain interface with graph
 async def tech_paper_miner_agent(query: str) -> Dict[str, Any]:
-    agent = TechPaperMinerAgent()
+    agent = _tech_paper_miner()
     task = {"description": query}
     state = {"intent": {"idea": query}}
     return await agent.run(task, state)
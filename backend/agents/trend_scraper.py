@@ -11,25 +11,52 @@ TrendScraper Agent
 - Uses Gemini (Native SDK) to adaptively plan collection AND summarize.
 """
 
-import json
 import asyncio
-import requests
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from loguru import logger
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from google.genai import types
 from infra.genai_client import GenAIClient
+from core.llm import gemini_slot
 from app.config import settings
-from core.utils import web_search
+from core.utils import web_search, json_loads, read_capped, http_session, TTLCache
 from core.types import Document
 
 
+# Per-document block fed to the summarizer prompt: (source, title, content)
+_CONTEXT_TMPL = "Source: %s\nTitle: %s\nContent: %s\n\n"
+
+# Total character budget for the TREND DATA block (keeps Gemini input tokens bounded)
+MAX_CONTEXT_CHARS = 12000
+# Per-document content cap inside that block
+_DOC_SNIPPET_CHARS = 1000
+
+# Fetch results keyed by (tool, args); repeat runs on a topic skip the network
+_FETCH_CACHE = TTLCache(maxsize=256, ttl=300)
+
+
+async def _cached_fetch(key: tuple, fetch) -> List[Dict[str, Any]]:
+    """Returns cached rows for `key`, otherwise awaits `fetch()` and caches non-empty results."""
+    cached = _FETCH_CACHE.get(key)
+    if cached is not None:
+        logger.debug("♻️ [TrendScraper] Cache hit for {}", key[0])
+        return cached
+
+    results = await fetch()
+    if results:
+        _FETCH_CACHE.set(key, results)
+    return results
+
+
 # ----------------------------------------------------------
 # Output Structure for Trends
 # ----------------------------------------------------------
 
 class TrendItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     trend_name: str = Field(..., description="Name of the emerging trend, pain point, or developer need.")
     short_summary: str = Field(..., description="Brief summary of the trend, including who it affects (e.g., developers, tech leads).")
     relevance_score: int = Field(..., description="Relevance score to the user's task (0–100)")
@@ -37,9 +64,94 @@ class TrendItem(BaseModel):
 
 class TrendList(BaseModel):
     """A list of current trends. This is the REQUIRED format for the final summary."""
+    model_config = ConfigDict(frozen=True)
+
     trends: List[TrendItem]
 
 
+# ----------------------------------------------------------
+# Tool Result Parsers (one row -> one Document)
+# ----------------------------------------------------------
+
+def _parse_news_row(article: Dict[str, Any], topic: str) -> Document:
+    title = article.get('title', '')
+    return Document(
+        page_content=f"Title: {title}\nDescription: {article.get('description', '')}",
+        metadata={
+            "source": article.get('url', ''),
+            "title": title,
+            "published_at": article.get('publishedAt', ''),
+            "data_source": "NewsAPI",
+            "query": topic,
+        },
+    )
+
+
+def _parse_reddit_row(post: Dict[str, Any], subreddit: str) -> Document:
+    title = post.get('title', '')
+    return Document(
+        page_content=title,
+        metadata={
+            "source": post.get('url', ''),
+            "title": title,
+            "score": post.get('score', 0),
+            "data_source": "Reddit",
+            "subreddit": subreddit,
+        },
+    )
+
+
+def _parse_tavily_row(result: Dict[str, Any], query: str) -> Document:
+    return Document(
+        page_content=result.get('content', ''),
+        metadata={
+            "source": result.get('url', ''),
+            "title": result.get('title', ''),
+            "score": result.get('score', 0),
+            "data_source": "Tavily",
+            "query": query,
+        },
+    )
+
+
+def _extract_reddit_posts(raw: bytes) -> List[Dict[str, Any]]:
+    """Pulls title/score/permalink out of a raw Reddit listing payload."""
+    data = json_loads(raw)
+    return [
+        {
+            "title": post["data"]["title"],
+            "score": post["data"]["score"],
+            "url": f"https://reddit.com{post['data']['permalink']}"
+        }
+        for post in data["data"]["children"]
+    ]
+
+
+def _build_context(documents: List[Document], budget: int = MAX_CONTEXT_CHARS) -> str:
+    """Renders documents into the summarizer context, stopping once `budget` chars are used."""
+    blocks = []
+    remaining = budget
+    for doc in documents:
+        block = _CONTEXT_TMPL % (
+            doc.metadata.get("source"), doc.metadata.get("title"), doc.page_content[:_DOC_SNIPPET_CHARS]
+        )
+        if len(block) > remaining:
+            if blocks:
+                break
+            block = block[:remaining]  # Always keep at least part of the first document
+        blocks.append(block)
+        remaining -= len(block)
+    return "".join(blocks)
+
+
+# Dispatch table: tool name -> (tool arg recorded on every row, row parser)
+_ROW_PARSERS = {
+    "NewsAPITool": ("topic", _parse_news_row),
+    "RedditTrendTool": ("subreddit", _parse_reddit_row),
+    "TavilyTrendSearch": ("query", _parse_tavily_row),
+}
+
+
 # ----------------------------------------------------------
 # Trends Scraper Agent (Native Implementation)
 # ----------------------------------------------------------
@@ -49,103 +161,90 @@ class TrendsScraperAgent:
         self.client = GenAIClient._make_client(api_key=settings.google_key_trend)
         self.model_name = settings.gemini_model
 
-    def _fetch_trending_news(self, topic: str = "technology", num_results: int = 10) -> str:
-        """Fetch latest news articles using NewsAPI."""
+    async def _fetch_trending_news(self, topic: str = "technology", num_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Fetch latest news articles using NewsAPI.
+        Runs in a thread pool to avoid blocking the event loop.
+        """
         api_key = settings.news_api_key
         if not api_key:
-            return "News API key not configured."
+            logger.warning("News API key not configured.")
+            return []
+
+        def _fetch():
+            try:
+                params = {
+                    "q": topic,
+                    "sortBy": "publishedAt",
+                    "pageSize": num_results,
+                    "language": "en",
+                    "apiKey": api_key,
+                }
+                with http_session.get(
+                    "https://newsapi.org/v2/everything", params=params, timeout=15, stream=True
+                ) as resp:
+                    resp.raise_for_status()
+                    data = json_loads(read_capped(resp))
+
+                return data.get("articles", [])
+            except Exception as e:
+                logger.warning(f"News API failed: {e}")
+                return []
 
-        try:
-            url = f"https://newsapi.org/v2/everything?q={topic}&sortBy=publishedAt&pageSize={num_results}&language=en&apiKey={api_key}"
-            resp = requests.get(url, timeout=15)
-            resp.raise_for_status()
-            data = resp.json()
-            
-            return json.dumps(data.get("articles", []), indent=2)
-        except Exception as e:
-            logger.warning(f"News API failed: {e}")
-            return f"News API failed: {e}"
+        loop = asyncio.get_running_loop()
+        return await _cached_fetch(
+            ("NewsAPITool", topic, num_results),
+            lambda: loop.run_in_executor(None, _fetch),
+        )
+
+    async def _fetch_reddit_trends(self, subreddit: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Fetch top Reddit posts from a specific, relevant subreddit.
+        Runs in a thread pool to avoid blocking the event loop.
+        """
+        def _fetch():
+            try:
+                logger.info(f"Attempting to fetch from subreddit: r/{subreddit}")
+                headers = {"User-Agent": "python:agentic-ai-researcher:v1.0 (by /u/agentic_ai)"}
+                url = f"https://www.reddit.com/r/{subreddit}/top/.json"
+                params = {"limit": limit, "t": "day"}
+                with http_session.get(url, params=params, headers=headers, timeout=10, stream=True) as resp:
+                    resp.raise_for_status()
+                    return _extract_reddit_posts(read_capped(resp))
+            except Exception as e:
+                logger.warning(f"Reddit fetch failed for r/{subreddit}: {e}")
+                return []
 
-    def _fetch_reddit_trends(self, subreddit: str, limit: int = 5) -> str:
-        """Fetch top Reddit posts from a specific, relevant subreddit."""
-        try:
-            logger.info(f"Attempting to fetch from subreddit: r/{subreddit}")
-            headers = {"User-Agent": "python:agentic-ai-researcher:v1.0 (by /u/agentic_ai)"}
-            url = f"https://www.reddit.com/r/{subreddit}/top/.json?limit={limit}&t=day"
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-
-            posts = [
-                {
-                    "title": post["data"]["title"],
-                    "score": post["data"]["score"],
-                    "url": f"https://reddit.com{post['data']['permalink']}"
-                }
-                for post in data["data"]["children"]
-            ]
-            return json.dumps(posts, indent=2)
-        except Exception as e:
-            logger.warning(f"Reddit fetch failed for r/{subreddit}: {e}")
-            return f"Reddit fetch failed for r/{subreddit}: {e}"
+        loop = asyncio.get_running_loop()
+        return await _cached_fetch(
+            ("RedditTrendTool", subreddit, limit),
+            lambda: loop.run_in_executor(None, _fetch),
+        )
 
-    async def _tavily_trend_search(self, query: str, num_results: int = 5) -> str:
+    async def _tavily_trend_search(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
         """Web search to discover broad trends or 'drill down' on specific new topics."""
         try:
-            results = await web_search(query, num_results)
-            return json.dumps(results, indent=2)
+            return await _cached_fetch(
+                ("TavilyTrendSearch", query, num_results),
+                lambda: web_search(query, num_results),
+            )
         except Exception as e:
             logger.warning(f"Tavily trend search failed: {e}")
-            return f"Tavily trend search failed: {e}"
+            return []
 
-    def _parse_results_to_documents(self, tool_name: str, tool_args: dict, tool_result_string: str) -> List[Document]:
-        """Converts the raw JSON output from tools into a list of Document objects."""
-        documents = []
-        try:
-            data = json.loads(tool_result_string)
-            if not isinstance(data, list):
-                return []
+    def _parse_results_to_documents(self, tool_name: str, tool_args: dict, data: List[Dict[str, Any]]) -> List[Document]:
+        """Converts the native tool output (a list of rows) into a list of Document objects."""
+        entry = _ROW_PARSERS.get(tool_name)
+        if entry is None or not isinstance(data, list):
+            return []
 
-            if tool_name == "NewsAPITool":
-                for article in data:
-                    content = f"Title: {article.get('title', '')}\nDescription: {article.get('description', '')}"
-                    metadata = {
-                        "source": article.get('url', ''),
-                        "title": article.get('title', ''),
-                        "published_at": article.get('publishedAt', ''),
-                        "data_source": "NewsAPI",
-                        "query": tool_args.get("topic", "")
-                    }
-                    documents.append(Document(page_content=content, metadata=metadata))
-            
-            elif tool_name == "RedditTrendTool":
-                for post in data:
-                    content = post.get('title', '')
-                    metadata = {
-                        "source": post.get('url', ''),
-                        "title": post.get('title', ''),
-                        "score": post.get('score', 0),
-                        "data_source": "Reddit",
-                        "subreddit": tool_args.get("subreddit", "")
-                    }
-                    documents.append(Document(page_content=content, metadata=metadata))
-
-            elif tool_name == "TavilyTrendSearch":
-                for result in data:
-                    content = result.get('content', '')
-                    metadata = {
-                        "source": result.get('url', ''),
-                        "title": result.get('title', ''),
-                        "score": result.get('score', 0),
-                        "data_source": "Tavily",
-                        "query": tool_args.get("query", "")
-                    }
-                    documents.append(Document(page_content=content, metadata=metadata))
-        
+        arg_name, parse_row = entry
+        arg_value = tool_args.get(arg_name, "")
+        try:
+            return [parse_row(row, arg_value) for row in data]
         except Exception as e:
-            logger.warning(f"Failed to parse JSON for {tool_name}: {e}")
-        
-        return documents
+            logger.warning(f"Failed to parse results for {tool_name}: {e}")
+            return []
 
     async def run(self, task: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
         """Executes trend analysis and returns BOTH summary and raw docs."""
@@ -156,30 +255,12 @@ class TrendsScraperAgent:
         try:
             collected_documents = []
 
-            # PHASE 1: BROAD SEARCH & SURVEYS
-            logger.info("📡 [TrendScraper] Phase 1: Broad Search & News")
-            
-            # Tavily for surveys/reports
+            # PHASE 1: BROAD SEARCH & SURVEYS (Tavily + NewsAPI)
             tavily_query = f"developer surveys and trends 2025 for {research_task_description}"
-            tavily_results = await self._tavily_trend_search(tavily_query)
-            collected_documents.extend(
-                self._parse_results_to_documents("TavilyTrendSearch", {"query": tavily_query}, tavily_results)
-            )
-
-            # NewsAPI
-            news_results = self._fetch_trending_news(topic=research_task_description, num_results=5)
-            collected_documents.extend(
-                self._parse_results_to_documents("NewsAPITool", {"topic": research_task_description}, news_results)
-            )
 
             # PHASE 2: DEEP DIVE (Tavily)
             # Simple heuristic: drill down on "pain points"
-            logger.info("🔍 [TrendScraper] Phase 2: Deep Dive")
             drill_down_query = f"major developer pain points and challenges in {research_task_description}"
-            drill_down_results = await self._tavily_trend_search(drill_down_query)
-            collected_documents.extend(
-                self._parse_results_to_documents("TavilyTrendSearch", {"query": drill_down_query}, drill_down_results)
-            )
 
             # PHASE 3: COMMUNITY PULSE (Reddit)
             # Heuristic: pick a subreddit based on keywords or default to 'programming'
@@ -190,19 +271,43 @@ class TrendsScraperAgent:
                 subreddit = "webdev"
             elif "security" in research_task_description.lower():
                 subreddit = "netsec"
-            
-            logger.info(f"💬 [TrendScraper] Phase 3: Community Pulse (r/{subreddit})")
-            reddit_results = self._fetch_reddit_trends(subreddit=subreddit)
-            collected_documents.extend(
-                self._parse_results_to_documents("RedditTrendTool", {"subreddit": subreddit}, reddit_results)
+
+            # The phases are independent network calls, so run them concurrently
+            logger.info(f"📡 [TrendScraper] Phases 1-3: Search, News, Deep Dive, Community Pulse (r/{subreddit})")
+            tavily_results, news_results, drill_down_results, reddit_results = await asyncio.gather(
+                self._tavily_trend_search(tavily_query),
+                self._fetch_trending_news(topic=research_task_description, num_results=5),
+                self._tavily_trend_search(drill_down_query),
+                self._fetch_reddit_trends(subreddit=subreddit),
+            )
+
+            parsed_batches = (
+                self._parse_results_to_documents("TavilyTrendSearch", {"query": tavily_query}, tavily_results),
+                self._parse_results_to_documents("NewsAPITool", {"topic": research_task_description}, news_results),
+                self._parse_results_to_documents("TavilyTrendSearch", {"query": drill_down_query}, drill_down_results),
+                self._parse_results_to_documents("RedditTrendTool", {"subreddit": subreddit}, reddit_results),
             )
 
+            # News and Tavily often surface the same article; keep the first copy per URL
+            seen_urls = set()
+            for batch in parsed_batches:
+                for doc in batch:
+                    url = doc.metadata.get("source")
+                    if url:
+                        if url in seen_urls:
+                            continue
+                        seen_urls.add(url)
+                    collected_documents.append(doc)
+
+            # Nothing to summarize: skip the Gemini round-trip entirely
+            if not collected_documents:
+                logger.warning("⚠️ [TrendScraper] No documents collected; skipping summarization.")
+                return {"success": False, "error": "No trend data collected"}
+
             # PHASE 4: SUMMARIZE (LLM)
             logger.info("📝 [TrendScraper] Phase 4: Summarize")
             
-            context_text = ""
-            for doc in collected_documents:
-                context_text += f"Source: {doc.metadata.get('source')}\nTitle: {doc.metadata.get('title')}\nContent: {doc.page_content[:1000]}\n\n"
+            context_text = _build_context(collected_documents)
 
             prompt = f"""
             You are an AI research analyst. Your goal is to find trends on:
@@ -215,16 +320,17 @@ class TrendsScraperAgent:
             Return the result as a JSON object matching the `TrendList` schema.
             """
 
-            response = await self.client.aio.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=TrendList,
-                    temperature=0.3,
-                    max_output_tokens=2048,
+            async with gemini_slot():
+                response = await self.client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        response_schema=TrendList,
+                        temperature=0.3,
+                        max_output_tokens=2048,
+                    )
                 )
-            )
 
             final_json = response.parsed
             
@@ -235,12 +341,12 @@ class TrendsScraperAgent:
                      logger.error("Failed to parse TrendList from LLM response")
                      return {"success": False, "error": "Failed to parse LLM response"}
 
-            summary_list = [trend.model_dump() for trend in final_json.trends]
+            summary_list = final_json.model_dump()["trends"]
 
             return {
                 "success": True,
                 "output_summary": summary_list,
-                "output_raw_docs": [d.dict() if hasattr(d, 'dict') else d for d in collected_documents],
+                "output_raw_docs": collected_documents,
                 "output_type": "TrendReport",
                 "meta": {"source": "GenAI+Native", "agent": "TrendsScraper"},
             }
@@ -250,9 +356,15 @@ class TrendsScraperAgent:
             return {"success": False, "error": str(e)}
 
 
+@lru_cache(maxsize=1)
+def _trends_scraper() -> TrendsScraperAgent:
+    """Shared agent, built on first use; it holds no per-run state."""
+    return TrendsScraperAgent()
+
+
 # Wrapper function to maintain interface with graph
 async def trend_scraper_agent(query: str) -> Dict[str, Any]:
-    agent = TrendsScraperAgent()
+    agent = _trends_scraper()
     task = {"description": query}
     state = {"intent": {"idea": query}}
     return await agent.run(task, state)
@@ -17,6 +17,7 @@ class ChatRequest(BaseModel):
     """Request model for simple chat endpoint."""
     message: str
     session_id: Optional[str] = "default"
+    force: bool = False  # Bypass cached answers and agent results
 
 
 class ChatResponse(BaseModel):
@@ -34,6 +35,7 @@ class ChatResponse(BaseModel):
 class PipelineRequest(BaseModel):
     """Request model for full research pipeline."""
     query: str
+    force: bool = False  # Bypass cached results and re-run the research
 
 
 class PipelineResponse(BaseModel):
@@ -5,6 +5,8 @@ Application Configuration
 Loads environment variables and defines application settings.
 """
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -27,6 +29,10 @@ class Settings(BaseSettings):
     google_key_report: str
 
     gemini_model: str = "gemini-2.5-flash"
+    # Cheaper/faster tier for short extraction and summarization calls
+    gemini_fast_model: str = "gemini-2.5-flash-lite"
+    # Max in-flight Gemini calls per process (keeps concurrent pipelines under the RPM quota)
+    llm_concurrency: int = 8
 
     # External APIs (Optional)
     tavily_api_key: str
@@ -38,4 +44,12 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Returns the process-wide Settings instance (.env is read once)."""
+    return Settings()
+
+
+# Built at import: db, llm and the route caches read settings at module level,
+# so deferring construction here would not delay the .env parse anyway.
+settings = get_settings()
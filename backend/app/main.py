@@ -2,30 +2,72 @@
 """
 Main Application
 ----------------
-FastAPI entry point. Configures middleware, routes, and startup events.
+FastAPI entry point. Configures middleware, routes, and the app lifespan.
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
+try:
+    import orjson  # noqa: F401  (ORJSONResponse needs it at render time)
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
 from app.config import settings
 from app.routes.pipeline import router as pipeline_router
 from app.routes.chat import router as chat_router
-from infra.db import init_schema
+from infra.db import init_schema, open_pool, close_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup/shutdown.
+    Opens the DB connection pool and initializes the schema (if DB is reachable),
+    then closes the pool on shutdown.
+    """
+    logger.info("🚀 Starting Agentic AI Backend...")
+    try:
+        await open_pool()
+        await init_schema()
+    except Exception as e:
+        logger.warning(f"⚠️ Database initialization skipped/failed: {e}")
+
+    yield
+
+    await close_pool()
 
 
 def create_app() -> FastAPI:
     """Creates and configures the FastAPI application."""
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=DefaultResponse)
+
+    # Errors: one wrapper instead of a try/except per route. Unexpected errors are
+    # logged with their traceback and answered with a generic 500 body.
+    # Registered before CORS, which therefore wraps it: the 500 still carries
+    # the CORS headers (an exception_handler(Exception) runs outside CORS).
+    @app.middleware("http")
+    async def unhandled_exception_middleware(request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as exc:
+            logger.opt(exception=exc).error(f"❌ [API] Unhandled error on {request.method} {request.url.path}")
+            return DefaultResponse({"detail": "Internal Server Error"}, status_code=500)
 
     # Middleware
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        # Explicit lists (the API only serves GET/POST with JSON bodies) and a
+        # 24h preflight cache, so browsers skip most OPTIONS round-trips.
+        allow_methods=["GET", "POST"],
+        allow_headers=["Content-Type", "Authorization"],
+        max_age=86400,
     )
 
     # Routes
@@ -38,19 +80,6 @@ def create_app() -> FastAPI:
 app = create_app()
 
 
-@app.on_event("startup")
-async def startup_event():
-    """
-    Application startup tasks.
-    Initializes database schema (if DB is reachable).
-    """
-    logger.info("🚀 Starting Agentic AI Backend...")
-    try:
-        await init_schema()
-    except Exception as e:
-        logger.warning(f"⚠️ Database initialization skipped/failed: {e}")
-
-
 @app.get("/")
 def home():
     """Health check endpoint."""
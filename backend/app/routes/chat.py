@@ -4,30 +4,43 @@ Chat Route
 ----------
 Simple chat endpoint that invokes the graph directly.
 Useful for debugging or simpler interactions.
+Repeat and near-duplicate messages are answered from a semantic cache.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 from api.schemas import ChatRequest, ChatResponse
+from app.config import settings
+from core.semantic_cache import SemanticCache
 from graph.graph_builder import agent_graph
 
 
 router = APIRouter(tags=["chat"])
 
+_answer_cache = SemanticCache(threshold=0.95, ttl=3600, api_key=settings.google_key_rag)
+
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(req: ChatRequest) -> ChatResponse:
     """
     Directly invokes the agent graph with a user message.
     """
-    try:
-        initial_state = {"user_input": req.message}
-        result_state = await agent_graph.ainvoke(initial_state)
-
-        return ChatResponse(
-            intent=result_state.get("intent", "unknown"),
-            summary=result_state.get("summary", ""),
-            report=result_state.get("final_report", ""),
-            debug_state=result_state if req.session_id == "debug" else None,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    debug = req.session_id == "debug"
+    if not (debug or req.force):
+        cached = await _answer_cache.get(req.message)
+        if cached is not None:
+            return cached
+
+    initial_state = {"user_input": req.message}
+    if req.force:
+        initial_state["force"] = True
+    result_state = await agent_graph.ainvoke(initial_state)
+
+    response = ChatResponse(
+        intent=result_state.get("intent", "unknown"),
+        summary=result_state.get("summary", ""),
+        report=result_state.get("final_report", ""),
+        debug_state=result_state if debug else None,
+    )
+    if not debug:
+        await _answer_cache.put(req.message, response)
+    return response
@@ -3,20 +3,26 @@
 Pipeline Route
 --------------
 Exposes the main agentic research pipeline via REST API.
+Repeat queries (same normalized text) are answered from a result cache.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from loguru import logger
 
 from api.schemas import PipelineRequest, PipelineResponse
-from core.pipeline import run_pipeline
+from core.pipeline import run_pipeline, persist_pipeline_results
+from core.semantic_cache import SemanticCache
 
 
 router = APIRouter(tags=["pipeline"])
 
+# Exact-query tier only: a report (with its intent and state) answers the query
+# that produced it, and must not be served for a merely similar idea
+_result_cache = SemanticCache(ttl=3600, semantic=False)
+
 
 @router.post("/pipeline/run", response_model=PipelineResponse)
-async def pipeline_run(req: PipelineRequest):
+async def pipeline_run(req: PipelineRequest, background_tasks: BackgroundTasks):
     """
     Executes the full agentic pipeline for a given query.
     
@@ -25,19 +31,23 @@ async def pipeline_run(req: PipelineRequest):
     - Runs agents (Competitor, Trends, Papers)
     - Retrieves context (RAG)
     - Generates final report
+    - Persists artifacts (disk + DB) after the response is sent
     """
     logger.info(f"🌐 [API] /pipeline/run called with query: {req.query}")
 
-    try:
-        result = await run_pipeline(req.query)
-    except Exception as e:
-        logger.error(f"❌ [API] Pipeline execution failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if not req.force:
+        cached = await _result_cache.get(req.query)
+        if cached is not None:
+            return cached  # Already persisted by the run that produced it
+
+    result = await run_pipeline(req.query, persist=False, force=req.force)
 
     if result.get("status") != "success":
         raise HTTPException(status_code=500, detail=result.get("message", "Pipeline failed"))
 
-    return PipelineResponse(
+    background_tasks.add_task(persist_pipeline_results, req.query, result)
+
+    response = PipelineResponse(
         status="success",
         intent=result.get("intent"),
         summary=result.get("summary"),
@@ -46,3 +56,5 @@ async def pipeline_run(req: PipelineRequest):
         retrieved_docs=result.get("retrieved_docs"),
         state=result.get("state"),
     )
+    await _result_cache.put(req.query, response)
+    return response
@@ -9,11 +9,57 @@ if the LLM is unavailable or fails.
 
 import re
 import json
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 from google import genai
+from pydantic import BaseModel, Field
 from app.config import settings
+from infra.genai_client import GenAIClient
+from core.llm import gemini_slot
+from core.utils import json_loads, TTLCache
+
+
+# Compiled once at import; the rule-based path runs these on every fallback parse
+# Capitalized one- or two-word names; lone words need 4+ chars (two-word
+# matches are always long enough), so no length post-filter is needed.
+_COMPETITOR_RE = re.compile(r"[A-Z][a-zA-Z]+\s[A-Z][a-zA-Z]+|[A-Z][a-zA-Z]{3,}")
+
+# LLM parses keyed by normalized query; re-runs and demo traffic skip the Gemini call
+_LLM_PARSE_CACHE = TTLCache(maxsize=2048, ttl=3600)
+
+
+def _cache_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+# --------------------------------------------------------------------
+# Structured Output Shape
+# --------------------------------------------------------------------
+
+class IntentSchema(BaseModel):
+    """Intent fields Gemini must return (enforced via response_schema)."""
+    industry: str = Field(..., description="Industry, e.g. AI, SaaS, E-commerce.")
+    target_audience: str = Field(..., description="Primary target audience.")
+    problem_statement: str = Field(..., description="The problem the idea addresses.")
+    intent_type: str = Field(
+        ..., description="One of: market_research, competitor_analysis, trend_analysis, technical_research."
+    )
+    complexity_level: str = Field(..., description="One of: low, medium, high.")
+    agent_triggers: List[str] = Field(
+        ..., description="Agents to trigger: competitor_scout, trend_scraper, tech_paper_miner."
+    )
+
+
+class IndexedIntent(IntentSchema):
+    """One entry of a batched reply, tagged with its query number."""
+    index: int = Field(..., description="Number of the query this entry answers.")
+
+
+class IntentBatch(BaseModel):
+    """Batched reply: one intent per query."""
+    intents: List[IndexedIntent]
 
 
 class IntentParser:
@@ -35,17 +81,36 @@ class IntentParser:
     ]
 
     INTENT_PATTERNS = {
-        "compare": r"(compare|vs|difference|better than)",
-        "trend": r"(trend|market|growth|statistics)",
-        "tech": r"(technology|innovation|research|paper)",
-        "idea": r"(idea|startup|launch|build)"
+        "compare": re.compile(r"(compare|vs|difference|better than)"),
+        "trend": re.compile(r"(trend|market|growth|statistics)"),
+        "tech": re.compile(r"(technology|innovation|research|paper)"),
+        "idea": re.compile(r"(idea|startup|launch|build)"),
     }
 
+    # Request coalescing: queries arriving within BATCH_WINDOW seconds (up to
+    # BATCH_MAX) share one Gemini call instead of paying a round-trip each.
+    BATCH_WINDOW = 0.02
+    BATCH_MAX = 8
+
+    # Output cap for one intent. Batched calls scale it with the batch size.
+    INTENT_MAX_TOKENS = 512
+
+    # Seconds parse() waits for the LLM before answering with the rule-based parse,
+    # counted from when the call gets a Gemini slot (queueing behind the shared
+    # limiter and the batch window don't eat into it)
+    LLM_DEADLINE = 1.2
+
     def __init__(self, use_llm: bool = True):
         self.use_llm = use_llm
         self.client = None
         if use_llm and (settings.google_key_planner or settings.google_api_key):
-             self.client = genai.Client(api_key=settings.google_key_planner or settings.google_api_key)
+             self.client = GenAIClient._make_client(api_key=settings.google_key_planner or settings.google_api_key)
+
+        # (query, result future, "call started" event) per waiting caller
+        self._pending: List[Tuple[str, asyncio.Future, asyncio.Event]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._late_parses: Set[asyncio.Task] = set()
 
     async def parse(self, user_input: str) -> Dict[str, Any]:
         """
@@ -60,48 +125,46 @@ class IntentParser:
         logger.info(f"🔍 Parsing intent: {user_input}")
 
         if self.use_llm and self.client:
-            try:
-                return await self._parse_with_llm(user_input)
-            except Exception as e:
-                logger.warning(f"⚠️ LLM parsing failed ({e}), falling back to regex rules.")
+            # Speculative: start the LLM parse, and if it misses the deadline
+            # answer with the (instant) rule-based parse instead.
+            started = asyncio.Event()
+            llm_task = asyncio.create_task(self._parse_with_llm(user_input, started))
+
+            # Wait (without a deadline) until the Gemini call is actually running
+            waiter = asyncio.create_task(started.wait())
+            await asyncio.wait({llm_task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+
+            done, _ = await asyncio.wait({llm_task}, timeout=self.LLM_DEADLINE)
+            if done:
+                try:
+                    return llm_task.result()
+                except Exception as e:
+                    logger.warning(f"⚠️ LLM parsing failed ({e}), falling back to regex rules.")
+            else:
+                logger.info(f"⏱️ LLM parse exceeded {self.LLM_DEADLINE}s, using rule-based parse")
+                # Let it finish in the background so the result lands in the parse cache
+                self._late_parses.add(llm_task)
+                llm_task.add_done_callback(self._late_parses.discard)
 
         return self._parse_with_rules(user_input)
 
-    async def _parse_with_llm(self, query: str) -> Dict[str, Any]:
-        """Uses Gemini to extract intent."""
-        prompt = f"""
-        You are an expert intent parser for a startup research assistant.
-        Analyze the following user query and extract structured intent.
-        
-        USER QUERY: "{query}"
-        
-        Return a JSON object with the following schema:
-        {{
-            "industry": "string (e.g., AI, SaaS, E-commerce)",
-            "target_audience": "string",
-            "problem_statement": "string",
-            "intent_type": "string (one of: market_research, competitor_analysis, trend_analysis, technical_research)",
-            "complexity_level": "string (low, medium, high)",
-            "agent_triggers": ["list of agents to trigger (competitor_scout, trend_scraper, tech_paper_miner)"]
-        }}
+    async def _parse_with_llm(self, query: str, started: Optional[asyncio.Event] = None) -> Dict[str, Any]:
+        """
+        Uses Gemini to extract intent (coalesced with concurrent queries).
+        `started` is set once the Gemini request holds its slot.
         """
+        key = _cache_key(query)
+        cached = _LLM_PARSE_CACHE.get(key)
+        if cached is not None:
+            logger.debug("♻️ Intent cache hit")
+            return {**cached, "raw_query": query}
 
         try:
-            # We need to import llm_generate here or use the client directly
-            # Since this class has self.client, let's use it directly but with the specific key
-            # However, self.client is already initialized with the specific key in __init__
-            
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt,
-                config=genai.types.GenerateContentConfig(
-                    max_output_tokens=1024,
-                    temperature=0.1
-                )
-            )
-            
-            text = response.text
-            parsed = self._safe_extract_json(text)
+            parsed = await self._enqueue(query, started or asyncio.Event())
+            # Only cache complete parses
+            if parsed.get("industry"):
+                _LLM_PARSE_CACHE.set(key, dict(parsed))
             parsed["raw_query"] = query
             
             logger.success("✅ LLM intent parsed successfully.")
@@ -111,6 +174,115 @@ class IntentParser:
             logger.warning(f"⚠️ LLM parsing failed ({e}), falling back to regex rules.")
             return self._parse_with_rules(query)
 
+    # ------------------------------------------------------------------
+    # Batching
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, query: str, started: asyncio.Event) -> asyncio.Future:
+        """
+        Queues `query` for the next batch and returns a future for its parsed intent.
+        `started` is set when the batch's Gemini call begins.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, future, started))
+
+        if len(self._pending) >= self.BATCH_MAX:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.BATCH_WINDOW, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Sends everything queued so far as one batch."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._batch_tasks.add(task)  # Keep a reference until it finishes
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future, asyncio.Event]]) -> None:
+        """Resolves every future in `batch` from a single Gemini call."""
+        queries = [q for q, _, _ in batch]
+        started = [event for _, _, event in batch]
+        try:
+            if len(queries) == 1:
+                text = await self._generate(self._build_prompt(queries[0]), IntentSchema, started=started)
+                results = [json_loads(text)]
+            else:
+                logger.info(f"📦 Parsing {len(queries)} intents in one call")
+                # Room for every entry, or the JSON is cut off and the whole batch falls back
+                max_tokens = max(2 * self.INTENT_MAX_TOKENS, self.INTENT_MAX_TOKENS * len(queries))
+                text = await self._generate(
+                    self._build_batch_prompt(queries), IntentBatch, max_output_tokens=max_tokens, started=started
+                )
+                results = self._split_batch_response(text, len(queries))
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), parsed in zip(batch, results):
+            if future.done():
+                continue
+            if parsed is None:
+                future.set_exception(ValueError("Missing entry in batched intent response"))
+            else:
+                future.set_result(parsed)
+
+    async def _generate(
+        self, prompt: str, schema: type, max_output_tokens: int = INTENT_MAX_TOKENS, started: Optional[List[asyncio.Event]] = None
+    ) -> str:
+        """
+        Runs `prompt` in JSON mode; the reply is guaranteed to match `schema` (no fences or prose).
+        Each event in `started` is set once the request holds a Gemini slot.
+        """
+        async with gemini_slot():
+            for event in started or ():
+                event.set()
+            response = await self.client.aio.models.generate_content(
+                model=settings.gemini_fast_model,
+                contents=prompt,
+                config=genai.types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=schema,
+                    max_output_tokens=max_output_tokens,
+                    temperature=0.0,
+                    # Thinking tokens count against the cap; extraction doesn't need them
+                    thinking_config=genai.types.ThinkingConfig(thinking_budget=0),
+                )
+            )
+        return response.text
+
+    # Field names and descriptions travel in the response schema, so the prompts stay terse.
+    def _build_prompt(self, query: str) -> str:
+        return f'Extract the startup research intent of this query.\nQUERY: "{query}"'
+
+    def _build_batch_prompt(self, queries: List[str]) -> str:
+        numbered = "\n".join(f'{i}. "{q}"' for i, q in enumerate(queries))
+        return (
+            f"Extract the startup research intent of each query independently. "
+            f"Return exactly {len(queries)} intents, each with the query number as index.\n"
+            f"QUERIES:\n{numbered}"
+        )
+
+    def _split_batch_response(self, text: str, n: int) -> List[Optional[Dict[str, Any]]]:
+        """Maps a batched IntentBatch reply back to query positions (None where missing)."""
+        results: List[Optional[Dict[str, Any]]] = [None] * n
+        items = json_loads(text).get("intents") or []
+        for pos, item in enumerate(items):
+            idx = item.pop("index", pos)
+            if isinstance(idx, int) and 0 <= idx < n and results[idx] is None:
+                results[idx] = item
+        return results
+
     def _parse_with_rules(self, text: str) -> Dict[str, Any]:
         """Fallback rule-based parser."""
         logger.info("🧩 Using rule-based parser")
@@ -121,17 +293,11 @@ class IntentParser:
         industry = next((d for d in self.DOMAINS if d in text_lower), "general")
         tech = [t for t in self.TECH_TERMS if t.lower() in text_lower]
         
-        intent_type = "idea"
-        for name, pattern in self.INTENT_PATTERNS.items():
-            if re.search(pattern, text_lower):
-                intent_type = name
-                break
+        intent_type = _classify_intent(text_lower)
 
-        # Naive competitor extraction (Capitalized words)
+        # Naive competitor extraction (Capitalized words, short ones dropped)
         # This is very rough, but better than nothing for a fallback
-        competitors = re.findall(r"[A-Z][a-zA-Z]+(?:\s[A-Z][a-zA-Z]+)?", text)
-        # Filter out common starting words if they appear at start of sentence (heuristic)
-        competitors = [c for c in competitors if len(c) > 3] 
+        competitors = _COMPETITOR_RE.findall(text)
 
         parsed = {
             "industry": industry,
@@ -166,27 +332,30 @@ class IntentParser:
         if "doctor" in text or "patient" in text: return "Healthcare Users"
         return "General Audience"
 
-    def _safe_extract_json(self, text: str) -> Dict[str, Any]:
-        """Extracts JSON from LLM output, handling markdown fences."""
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(0))
-            except json.JSONDecodeError:
-                pass
-
-        return {
-            "industry": None,
-            "business_model": None,
-            "target_audience": None,
-            "tech_keywords": [],
-            "competitor_names": [],
-            "intent_type": "idea",
-        }
+
+# All INTENT_PATTERNS in one zero-width alternation, highest priority first.
+# At each position the first matching branch wins, so the best-ranked hit over
+# the whole text equals the old "first pattern that matches anywhere" loop.
+_INTENT_NAMES = list(IntentParser.INTENT_PATTERNS)
+_INTENT_RE = re.compile(
+    "(?=" + "|".join(f"(?P<{name}>{pattern.pattern})" for name, pattern in IntentParser.INTENT_PATTERNS.items()) + ")"
+)
+
+
+def _classify_intent(text_lower: str) -> str:
+    """Returns the highest-priority intent whose pattern occurs in `text_lower` (default "idea")."""
+    best = len(_INTENT_NAMES)
+    for match in _INTENT_RE.finditer(text_lower):
+        rank = _INTENT_NAMES.index(match.lastgroup)
+        if rank < best:
+            best = rank
+            if rank == 0:
+                break
+    return _INTENT_NAMES[best] if best < len(_INTENT_NAMES) else "idea"
 
 
 if __name__ == "__main__":
     # CLI Test
     parser = IntentParser()
     q = "GitHub repository analysis tool for developers"
-    print(json.dumps(parser.parse(q), indent=2))
\ No newline at end of file
+    print(json.dumps(asyncio.run(parser.parse(q)), indent=2))
\ No newline at end of file
@@ -4,16 +4,25 @@ LLM Module
 ----------
 Provides asynchronous wrappers for text generation and embedding using Google GenAI.
 Acts as a bridge between the application core and the infrastructure layer.
+All Gemini calls share one semaphore (infra.genai_client), so concurrent
+pipelines overlap their requests without exceeding `settings.llm_concurrency`
+in flight (avoids 429 storms). GenAIClient takes a slot per attempt; code that
+calls the SDK client directly takes one via `gemini_slot()`.
 """
 
+import asyncio
 from typing import List, Optional
 
 from loguru import logger
 
-from infra.genai_client import GenAIClient
+from infra.genai_client import GenAIClient, gemini_slot  # noqa: F401  (re-exported)
 from app.config import settings
 
 
+# Max inputs per embed_content request (Gemini batch embedding limit)
+EMBED_BATCH_LIMIT = 100
+
+
 async def llm_generate(
     prompt: str,
     model: Optional[str] = None,
@@ -36,7 +45,8 @@ async def llm_generate(
     """
     model_name = model or settings.gemini_model
 
-    logger.debug(f"🤖 [LLM] Generating with {model_name} (len={len(prompt)})")
+    # Positional args: loguru only formats the message if DEBUG is enabled
+    logger.debug("🤖 [LLM] Generating with {} (len={})", model_name, len(prompt))
 
     return await GenAIClient.generate_async(
         model=model_name,
@@ -53,9 +63,12 @@ async def embed_texts(
     dim: int = 768,
     task: str = "RETRIEVAL_DOCUMENT",
     api_key: Optional[str] = None,
+    max_retries: Optional[int] = None,
 ) -> List[List[float]]:
     """
     Generates embeddings for a list of texts.
+    Texts are sent in batches of up to EMBED_BATCH_LIMIT per request and the
+    batches run concurrently.
     
     Args:
         texts (List[str]): List of strings to embed.
@@ -63,6 +76,7 @@ async def embed_texts(
         dim (int): Output dimension.
         task (str): Task type.
         api_key (str, optional): Specific API key to use.
+        max_retries (int, optional): Attempts per batch (defaults to GenAIClient.MAX_RETRIES).
         
     Returns:
         List[List[float]]: List of embedding vectors.
@@ -70,6 +84,16 @@ async def embed_texts(
     if not texts:
         return []
 
-    logger.debug(f"🧠 [EMBED] Embedding {len(texts)} texts with {model}")
+    logger.debug("🧠 [EMBED] Embedding {} texts with {}", len(texts), model)
+
+    async def _embed_batch(batch: List[str]) -> List[List[float]]:
+        return await GenAIClient.embed_async(
+            batch, model=model, dim=dim, task=task, api_key=api_key, max_retries=max_retries
+        )
+
+    if len(texts) <= EMBED_BATCH_LIMIT:
+        return await _embed_batch(texts)
 
-    return await GenAIClient.embed_async(texts, model=model, dim=dim, task=task, api_key=api_key)
+    batches = [texts[i : i + EMBED_BATCH_LIMIT] for i in range(0, len(texts), EMBED_BATCH_LIMIT)]
+    results = await asyncio.gather(*(_embed_batch(b) for b in batches))
+    return [vec for batch_vectors in results for vec in batch_vectors]
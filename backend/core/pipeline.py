@@ -6,15 +6,16 @@ The main entry point for the agentic pipeline.
 Orchestrates the flow from user query -> graph execution -> result persistence.
 """
 
-import json
+import asyncio
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from loguru import logger
 
 from graph.graph_builder import agent_graph
 from core.types import Document
-from infra.memory_store import save_text, save_json
+from core.utils import json_dumps_pretty
+from infra.memory_store import save_text, save_json, write_atomic
 from infra.db import save_pipeline_result, is_db_available
 
 # Constants
@@ -23,12 +24,19 @@ RAW_DOCS_DIR = DATA_DIR / "raw_docs"
 RAW_DOCS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-async def run_pipeline(user_query: str) -> Dict[str, Any]:
+async def run_pipeline(
+    user_query: str,
+    persist: bool = True,
+    force: bool = False,
+) -> Dict[str, Any]:
     """
     Executes the full research pipeline for a given user query.
     
     Args:
         user_query (str): The startup idea or research topic.
+        persist (bool): Save artifacts before returning. Pass False to defer
+            them to `persist_pipeline_results` (e.g. a background task).
+        force (bool): Re-run the agents even if results for this query are cached.
         
     Returns:
         Dict[str, Any]: A dictionary containing the pipeline status and results.
@@ -38,6 +46,8 @@ async def run_pipeline(user_query: str) -> Dict[str, Any]:
     try:
         # 1. Initialize State
         initial_state = {"user_input": user_query}
+        if force:
+            initial_state["force"] = True
 
         # 2. Run Graph
         final_state = await agent_graph.ainvoke(initial_state)
@@ -48,7 +58,8 @@ async def run_pipeline(user_query: str) -> Dict[str, Any]:
         results = _extract_results(final_state)
         
         # 4. Persist Artifacts (Local & DB)
-        await _persist_results(user_query, results, final_state)
+        if persist:
+            await _persist_results(user_query, results, final_state)
 
         logger.info("✅ [PIPELINE] Completed successfully.")
         return {
@@ -65,6 +76,17 @@ async def run_pipeline(user_query: str) -> Dict[str, Any]:
         }
 
 
+async def persist_pipeline_results(user_query: str, result: Dict[str, Any]) -> None:
+    """
+    Persists a successful `run_pipeline(..., persist=False)` result.
+    Safe to run after the response is sent: failures are logged, never raised.
+    """
+    try:
+        await _persist_results(user_query, result, result.get("state") or {})
+    except Exception as e:
+        logger.error(f"❌ [PIPELINE] Deferred persistence failed: {e}")
+
+
 def _extract_results(state: Dict[str, Any]) -> Dict[str, Any]:
     """Extracts key components from the final graph state."""
     retrieved_docs = state.get("retrieved_docs", [])
@@ -89,37 +111,71 @@ def _extract_results(state: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _sanitize_for_json(obj: Any) -> Any:
-    """Recursively converts Document objects to dicts for JSON serialization."""
-    if isinstance(obj, list):
-        return [_sanitize_for_json(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: _sanitize_for_json(v) for k, v in obj.items()}
-    elif hasattr(obj, "dict"): # Pydantic models or Documents with dict() method
+# Values that are already JSON-ready; checked by exact type before any probing
+_JSON_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
+def _sanitize_leaf(obj: Any) -> Any:
+    """Converts a single non-container value (pydantic model, Document, ...)."""
+    if hasattr(obj, "dict"): # Pydantic models or Documents with dict() method
         return obj.dict()
-    elif hasattr(obj, "to_json"):
+    if hasattr(obj, "to_json"):
         return obj.to_json()
-    elif hasattr(obj, "page_content") and hasattr(obj, "metadata"): # Document object
+    if hasattr(obj, "page_content") and hasattr(obj, "metadata"): # Document object
         return {"page_content": obj.page_content, "metadata": obj.metadata}
-    else:
-        return obj
+    return obj
+
+
+def _sanitize_for_json(obj: Any) -> Any:
+    """
+    Converts Document objects to dicts for JSON serialization.
+    Nested lists/dicts are copied with an explicit work stack rather than
+    recursion, so deep states cost no Python call frames per level.
+    """
+    root = [obj]
+    stack = [(root, 0)]
+    while stack:
+        container, key = stack.pop()
+        value = container[key]
+        kind = type(value)
+        if kind in _JSON_SCALARS:
+            continue
+        if kind is list or isinstance(value, list):
+            copy = list(value)
+            stack.extend((copy, i) for i in range(len(copy)))
+        elif kind is dict or isinstance(value, dict):
+            copy = dict(value)
+            stack.extend((copy, k) for k in copy)
+        else:
+            copy = _sanitize_leaf(value)
+        container[key] = copy
+    return root[0]
+
+
+def _iter_json_array(items: List[Any]) -> Iterator[bytes]:
+    """Encodes `items` as a JSON array one element at a time (streamed to disk by write_atomic)."""
+    yield b"["
+    for i, item in enumerate(items):
+        yield b"\n" if i == 0 else b",\n"
+        yield json_dumps_pretty(item)
+    yield b"\n]\n"
+
 
 async def _persist_results(user_query: str, results: Dict[str, Any], final_state: Dict[str, Any]) -> None:
     """Saves pipeline artifacts to disk and database concurrently."""
     
-    # Sanitize data for serialization
-    sanitized_intent = _sanitize_for_json(results["intent"] or {})
-    sanitized_outputs = _sanitize_for_json(results["agent_outputs"])
+    # Sanitize data for serialization. The state is walked once; intent and
+    # agent_outputs are taken from it (as _extract_results does) rather than
+    # sanitizing the same subtrees again.
     sanitized_state = _sanitize_for_json(final_state)
+    sanitized_intent = sanitized_state.get("intent") or {}
+    sanitized_outputs = sanitized_state.get("agent_outputs", [])
 
-    async def _save_local():
+    def _write_local():
         # Save raw docs locally
         raw_docs_path = RAW_DOCS_DIR / "raw_docs.json"
         try:
-            raw_docs_path.write_text(
-                json.dumps(results["retrieved_docs"], ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
+            write_atomic(raw_docs_path, _iter_json_array(results["retrieved_docs"]))
         except Exception as e:
             logger.warning(f"⚠️ Failed to save raw docs locally: {e}")
 
@@ -131,6 +187,10 @@ async def _persist_results(user_query: str, results: Dict[str, Any], final_state
         save_json("last_agent_outputs", sanitized_outputs)
         save_json("last_state", sanitized_state)
 
+    async def _save_local():
+        # Disk writes + JSON encoding are blocking; keep them off the event loop
+        await asyncio.to_thread(_write_local)
+
     async def _save_db():
         # Save to Database (if available)
         if results["final_report"] and await is_db_available():
@@ -145,5 +205,4 @@ async def _persist_results(user_query: str, results: Dict[str, Any], final_state
                 logger.error(f"⚠️ Failed to persist to DB: {e}")
 
     # Run concurrently
-    import asyncio
     await asyncio.gather(_save_local(), _save_db())
@@ -9,17 +9,57 @@ Manages the retrieval-augmented generation pipeline.
 - Performs semantic search.
 """
 
-import json
+import asyncio
+import hashlib
+from array import array
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
 from core.llm import embed_texts
 from core.types import Document
-from infra.db import db_execute, db_query
+from core.utils import TTLCache, json_dumps, json_loads
+from infra.db import EMBEDDING_TYPE, FALLBACK_EMBEDDING_TYPE, db_execute, db_execute_many, db_query, embedding_type
 from app.config import settings
 
 
+# Gemini's embed_content accepts up to 100 inputs per request; fewer, larger
+# batches mean fewer round-trips (and fewer retries/backoffs under rate limits).
+EMBED_BATCH_SIZE = 100
+
+# Search-query embeddings by query text; repeat searches skip the embedding call
+_QUERY_EMBEDDINGS = TTLCache(maxsize=256, ttl=3600)
+
+# Chunk embeddings by content hash (packed float32, ~3 KB each). rag_node
+# re-indexes every run, so repeat queries re-embed only chunks that changed.
+_CHUNK_EMBEDDINGS = TTLCache(maxsize=2048, ttl=3600)
+
+
+def _content_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+# Hot statements, kept as constants so their text is byte-identical on every
+# call and psycopg can reuse the server-side prepared plan on pooled connections.
+# One variant per column type; parameters must be cast to the live column type.
+_INSERT_CHUNK_SQL = {
+    vtype: f"""
+INSERT INTO document_chunks (content, metadata, embedding)
+VALUES (%s, %s, %s::{vtype})
+"""
+    for vtype in (EMBEDDING_TYPE, FALLBACK_EMBEDDING_TYPE)
+}
+
+_SEARCH_SQL = {
+    vtype: f"""
+SELECT content, metadata, embedding <=> %s::{vtype} AS distance
+FROM document_chunks
+ORDER BY distance ASC
+LIMIT %s
+"""
+    for vtype in (EMBEDDING_TYPE, FALLBACK_EMBEDDING_TYPE)
+}
+
+
 def _chunk_text(text: str, chunk_size: int = 1500, overlap: int = 150) -> List[str]:
     """
     Splits text into overlapping chunks.
@@ -32,18 +72,14 @@ def _chunk_text(text: str, chunk_size: int = 1500, overlap: int = 150) -> List[s
     Returns:
         List[str]: List of text chunks.
     """
-    chunks = []
-    start = 0
     n = len(text)
+    if not n:
+        return []
 
-    while start < n:
-        end = min(start + chunk_size, n)
-        chunks.append(text[start:end])
-        if end == n:
-            break
-        start = end - overlap
-
-    return chunks
+    # Chunk k starts at k * step; a new chunk is needed while the previous one
+    # stopped short of the end, i.e. for starts below n - overlap.
+    step = chunk_size - overlap
+    return [text[start : start + chunk_size] for start in range(0, max(n - overlap, 1), step)]
 
 
 def _sanitize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
@@ -57,7 +93,7 @@ def _sanitize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
         elif isinstance(v, list):
             clean[k] = ", ".join(map(str, v))
         elif isinstance(v, dict):
-            clean[k] = json.dumps(v, ensure_ascii=False)
+            clean[k] = json_dumps(v)
         else:
             clean[k] = str(v)
     return clean
@@ -86,10 +122,14 @@ class VectorStoreManager:
 
         logger.info(f"📄 Processing {len(documents)} documents...")
 
-        # 1. Chunking
+        # 1. Chunking (identical documents are only chunked and embedded once)
         chunks: List[Dict[str, Any]] = []
+        seen_texts = set()
         for doc in documents:
             text = doc.get("page_content") or ""
+            if text in seen_texts:
+                continue
+            seen_texts.add(text)
             meta = _sanitize_metadata(doc.get("metadata", {}))
             for chunk_text in _chunk_text(text):
                 chunks.append({"content": chunk_text, "metadata": meta})
@@ -99,31 +139,60 @@ class VectorStoreManager:
 
         logger.info(f"✂️ Created {len(chunks)} chunks.")
 
-        # 2. Embedding & Storage (Batched)
-        BATCH_SIZE = 16
-        sql = """
-        INSERT INTO document_chunks (content, metadata, embedding)
-        VALUES (%s, %s, %s)
-        """
-
-        for i in range(0, len(chunks), BATCH_SIZE):
-            batch = chunks[i : i + BATCH_SIZE]
-            texts = [c["content"] for c in batch]
-
+        # 2. Embedding: reuse cached vectors, embed the rest (all batches in
+        #    flight at once; the shared Gemini semaphore in core.llm bounds
+        #    how many requests actually run)
+        keys = [_content_key(c["content"]) for c in chunks]
+        vectors = [_CHUNK_EMBEDDINGS.get(key) for key in keys]
+        cached = [n for n, vec in enumerate(vectors) if vec is not None]
+        missing = [n for n, vec in enumerate(vectors) if vec is None]
+        if cached:
+            logger.info(f"♻️ Reusing {len(cached)} cached chunk embeddings.")
+
+        # 3. Storage: a writer drains a queue of ready chunk indices (cached ones
+        #    first, then each embedding batch as soon as it returns), so inserts
+        #    overlap the embedding requests still in flight
+        queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+        async def embed_batch(batch: List[int]) -> None:
             try:
-                embeddings = await embed_texts(texts, api_key=settings.google_key_rag)
+                embeddings = await embed_texts([chunks[n]["content"] for n in batch], api_key=settings.google_key_rag)
             except Exception as e:
-                logger.error(f"❌ Embedding batch {i} failed: {e}")
-                continue
-
-            # Insert batch
-            for c, emb in zip(batch, embeddings):
-                if not emb: 
-                    continue # Skip failed embeddings
-                
-                await db_execute(sql, [c["content"], json.dumps(c["metadata"]), emb])
-
-            logger.info(f"  > Stored chunks {i+1}-{min(i+len(batch), len(chunks))}")
+                logger.error(f"❌ Embedding batch {batch[0]} failed: {e}")
+                return
+            ready = []
+            for n, emb in zip(batch, embeddings):
+                if emb:  # Skip failed embeddings
+                    vectors[n] = array("f", emb)
+                    _CHUNK_EMBEDDINGS.set(keys[n], vectors[n])
+                    ready.append(n)
+            if ready:
+                await queue.put(ready)
+
+        async def produce() -> None:
+            for i in range(0, len(cached), EMBED_BATCH_SIZE):
+                await queue.put(cached[i : i + EMBED_BATCH_SIZE])
+            await asyncio.gather(
+                *(embed_batch(missing[i : i + EMBED_BATCH_SIZE]) for i in range(0, len(missing), EMBED_BATCH_SIZE))
+            )
+            await queue.put(None)  # Sentinel: nothing more to store
+
+        async def consume() -> None:
+            stored = 0
+            while True:
+                ready = await queue.get()
+                if ready is None:
+                    break
+                rows = [[chunks[n]["content"], json_dumps(chunks[n]["metadata"]), vectors[n].tolist()] for n in ready]
+                await db_execute_many(_INSERT_CHUNK_SQL[embedding_type()], rows)
+                logger.info(f"  > Stored chunks {stored + 1}-{stored + len(rows)}")
+                stored += len(rows)
+
+        # If either side fails the TaskGroup cancels the other, so a dead writer
+        # can't leave the producer blocked on a full queue (and vice versa)
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(produce())
+            tg.create_task(consume())
 
         logger.info("✅ All chunks stored.")
 
@@ -140,33 +209,28 @@ class VectorStoreManager:
         """
         logger.info(f"🔍 Searching for: {query}")
 
-        # Generate query embedding
-        embeddings = await embed_texts([query], api_key=settings.google_key_rag)
-        if not embeddings or not embeddings[0]:
-            logger.warning("⚠️ Failed to embed query.")
-            return []
-            
-        query_emb = embeddings[0]
+        query_emb = _QUERY_EMBEDDINGS.get(query)
+        if not query_emb:
+            # Generate query embedding
+            embeddings = await embed_texts([query], api_key=settings.google_key_rag)
+            if not embeddings or not embeddings[0]:
+                logger.warning("⚠️ Failed to embed query.")
+                return []
+
+            query_emb = embeddings[0]
+            _QUERY_EMBEDDINGS.set(query, query_emb)
 
         # SQL for cosine similarity (using <-> operator for L2 distance, order by distance ASC)
         # Note: For cosine similarity with normalized vectors, L2 distance order is same as cosine distance.
         # pgvector's <-> is L2 distance. <=> is cosine distance. 
         # text-embedding-004 vectors are normalized, so either works, but <=> is explicit for cosine.
         # Let's use <=> for cosine distance.
-        
-        sql = """
-        SELECT content, metadata, embedding <=> %s::vector AS distance
-        FROM document_chunks
-        ORDER BY distance ASC
-        LIMIT %s
-        """
-
-        rows = await db_query(sql, [query_emb, k])
+        rows = await db_query(_SEARCH_SQL[embedding_type()], [query_emb, k])
 
         docs = []
         for content, metadata, distance in rows:
             try:
-                meta = json.loads(metadata) if isinstance(metadata, str) else metadata
+                meta = json_loads(metadata) if isinstance(metadata, str) else metadata
             except Exception:
                 meta = {}
             
@@ -0,0 +1,132 @@
+# core/semantic_cache.py
+"""
+Semantic Cache
+--------------
+Two-tier, in-process answer cache for expensive query -> answer calls.
+
+1. Exact tier: keyed by a hash of the normalized query text (no API calls).
+2. Semantic tier: the query is embedded and compared (cosine similarity)
+   against previously answered queries; a close enough match is reused.
+
+Entries expire after `ttl` seconds and the oldest are evicted past `maxsize`.
+Vectors are held as packed float32 arrays (~3 KB per 768-d vector instead of
+~25 KB as a list of Python floats).
+Embedding failures (or a lookup embed slower than EMBED_TIMEOUT) only disable
+the semantic tier for that lookup.
+With `semantic=False` only the exact tier is used (no embedding calls at all).
+"""
+
+import asyncio
+import hashlib
+import math
+import operator
+from array import array
+from typing import Any, List, Optional, Tuple
+
+from loguru import logger
+
+from core.llm import embed_texts
+from core.utils import TTLCache
+
+
+# The lookup sits in front of every cold request: one attempt, no backoff,
+# and give up quickly rather than delay the real work
+EMBED_TIMEOUT = 0.5  # seconds
+
+
+def _normalize(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _unit(vec: List[float]) -> array:
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return array("f", [x / norm for x in vec])
+
+
+def _nearest(q: array, entries: List[tuple], threshold: float) -> Tuple[Any, float]:
+    """Best (answer, cosine) among `entries` at or above `threshold`; (None, threshold) if none."""
+    best, best_score = None, threshold
+    for _, (vec, value) in entries:
+        if vec is None:
+            continue
+        score = sum(map(operator.mul, q, vec))
+        if score >= best_score:
+            best, best_score = value, score
+    return best, best_score
+
+
+class SemanticCache:
+    """
+    Caches answers by exact query and by embedding similarity.
+    Meant to be used from the event loop (no locking).
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        maxsize: int = 256,
+        ttl: float = 3600.0,
+        api_key: Optional[str] = None,
+        task: str = "SEMANTIC_SIMILARITY",
+        semantic: bool = True,
+    ):
+        self.threshold = threshold
+        self.semantic = semantic
+        self.api_key = api_key
+        self.task = task
+        # key -> (unit query embedding or None, answer)
+        self._answers = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Embeddings computed on a miss, reused by put() once the answer is ready
+        self._pending = TTLCache(maxsize=64, ttl=600)
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return hashlib.sha256(_normalize(query).encode("utf-8")).hexdigest()
+
+    async def _embed(self, query: str) -> Optional[array]:
+        try:
+            vectors = await asyncio.wait_for(
+                embed_texts([query], task=self.task, api_key=self.api_key, max_retries=1),
+                timeout=EMBED_TIMEOUT,
+            )
+            return _unit(vectors[0]) if vectors and vectors[0] else None
+        except asyncio.TimeoutError:
+            logger.debug("⏱️ [SemanticCache] Embedding timed out, exact match only")
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ [SemanticCache] Embedding failed, exact match only: {e}")
+            return None
+
+    async def get(self, query: str) -> Optional[Any]:
+        """Returns a cached answer for `query` (or a near-duplicate of it), else None."""
+        key = self._key(query)
+        entry = self._answers.get(key)
+        if entry is not None:
+            logger.debug("♻️ [SemanticCache] Exact hit")
+            return entry[1]
+        if not self.semantic:
+            return None
+
+        q = await self._embed(query)
+        if q is None:
+            return None
+        self._pending.set(key, q)
+
+        # Up to maxsize x 768 multiply-adds in Python: scan a snapshot off the event loop
+        best, best_score = await asyncio.to_thread(_nearest, q, self._answers.items(), self.threshold)
+
+        if best is not None:
+            logger.debug("♻️ [SemanticCache] Semantic hit (cos={:.3f})", best_score)
+        return best
+
+    async def put(self, query: str, value: Any) -> None:
+        """Stores the answer for `query`, embedding it if `get()` has not already."""
+        key = self._key(query)
+        q = None
+        if self.semantic:
+            q = self._pending.get(key) or await self._embed(query)
+        self._answers.set(key, (q, value))
+
+    def clear(self) -> None:
+        self._answers.clear()
+        self._pending.clear()
@@ -6,12 +6,13 @@ Provides functionality to summarize text chunks using the LLM.
 Uses the unified core.llm module for robust API calls.
 """
 
-from typing import List
+from typing import List, Optional
 
 from loguru import logger
 
 from core.llm import llm_generate
 from core.types import Document
+from app.config import settings
 
 
 class Summarizer:
@@ -19,8 +20,8 @@ class Summarizer:
     Summarizes text contexts into concise insights.
     """
 
-    def __init__(self, model: str = "gemini-2.0-flash"):
-        self.model = model
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or settings.gemini_fast_model
 
     async def summarize(self, query: str, contexts: List[str]) -> str:
         """
@@ -88,7 +89,7 @@ async def summarize_docs(docs: List[Document]) -> str:
     """
 
     try:
-        return await llm_generate(prompt, model="gemini-2.0-flash")
+        return await llm_generate(prompt, model=settings.gemini_fast_model)
     except Exception as e:
         logger.error(f"❌ Document summarization failed: {e}")
         return ""
\ No newline at end of file
@@ -11,11 +11,13 @@ from dataclasses import dataclass, field
 from typing import Any, Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """
     Represents a text document with associated metadata.
     Used for RAG (Retrieval Augmented Generation).
+
+    Slotted: agents build one per search hit/scrape, so no per-instance __dict__.
     """
     page_content: str
     metadata: Dict[str, Any] = field(default_factory=dict)
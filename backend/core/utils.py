@@ -4,6 +4,9 @@ Core Utilities
 --------------
 Shared helper functions for agents and core logic.
 Includes:
+- Fast JSON encode/decode (orjson when installed).
+- A shared, pooled HTTP session.
+- A small TTL/LRU cache for repeat lookups.
 - JSON extraction from LLM output.
 - Web search utilities (Tavily, DuckDuckGo).
 - URL normalization.
@@ -13,51 +16,208 @@ Includes:
 import asyncio
 import json
 import re
+import time
 import requests
-from typing import Any, Dict, List, Optional, Union
+from http.cookiejar import DefaultCookiePolicy
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Union
 from urllib.parse import urlparse, parse_qs, unquote
 
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 from app.config import settings
 
+try:
+    import orjson  # Optional: Rust-backed JSON, several times faster on large payloads
+except ImportError:
+    orjson = None
+
+
+# --------------------------------------------------------------------
+# Fast JSON
+# --------------------------------------------------------------------
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parses JSON with orjson when available, falling back to stdlib json.
+    Both raise json.JSONDecodeError (orjson's error subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> str:
+    """Serializes to a compact JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def json_dumps_pretty(obj: Any) -> bytes:
+    """Serializes to 2-space indented UTF-8 JSON bytes, ready to write to disk (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+# --------------------------------------------------------------------
+# Shared HTTP Session
+# --------------------------------------------------------------------
+
+class _NoCookiePolicy(DefaultCookiePolicy):
+    """Rejects every cookie: the shared session must not carry state between users' scrapes."""
+
+    def set_ok(self, cookie, request) -> bool:
+        return False
+
+
+def _build_session() -> requests.Session:
+    """
+    One pooled session for all outbound calls, so repeat requests to the same
+    host (Tavily, NewsAPI, Reddit) reuse keep-alive sockets instead of paying
+    a fresh TCP + TLS handshake each time. Failed connects retry twice; read
+    timeouts do not, so each call's timeout stays its worst case.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(_NoCookiePolicy())
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, read=0, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip", "Connection": "keep-alive"})
+    return session
+
+
+http_session = _build_session()
+
+
+# --------------------------------------------------------------------
+# Caching
+# --------------------------------------------------------------------
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries expire after `ttl` seconds.
+    Meant to be used from the event loop (no locking).
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value, or `default` if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value, evicting the least recently used entries past `maxsize`."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def items(self) -> List[tuple]:
+        """Returns a snapshot of live (key, value) pairs, oldest first."""
+        now = time.monotonic()
+        return [(key, value) for key, (expires_at, value) in self._data.items() if expires_at >= now]
+
+    def clear(self) -> None:
+        self._data.clear()
+
 
 # --------------------------------------------------------------------
 # JSON Extraction
 # --------------------------------------------------------------------
 
+_FENCE_RE = re.compile(r"```(?:json)?")
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _balanced_spans(text: str, opener: str) -> Iterator[str]:
+    """
+    Yields each top-level `{...}` / `[...]` span in `text`, in order.
+
+    One forward pass tracking bracket depth (brackets inside JSON strings are
+    ignored), so it is O(n) even on long, unbalanced LLM output where a
+    greedy DOTALL regex would backtrack.
+    """
+    closer = _CLOSERS[opener]
+    start = text.find(opener)
+    while start != -1:
+        depth, in_string, escaped = 0, False, False
+        end = -1
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == opener:
+                depth += 1
+            elif ch == closer:
+                depth -= 1
+                if depth == 0:
+                    end = i
+                    break
+        if end == -1:
+            return  # Unbalanced tail
+        yield text[start:end + 1]
+        start = text.find(opener, end + 1)
+
+
 def extract_json_list(text: str) -> List[Dict[str, Any]]:
     """Extracts a JSON list from text (robust to markdown blocks)."""
     if not text:
         return []
     
     # Remove markdown code blocks
-    text = re.sub(r"```(?:json)?", "", text)
+    text = _FENCE_RE.sub("", text)
     text = text.replace("```", "").strip()
 
     try:
-        parsed = json.loads(text)
+        parsed = json_loads(text)
         if isinstance(parsed, list):
             return parsed
     except json.JSONDecodeError:
         pass
 
-    # Try finding [ ... ]
-    match = re.search(r"\[.*\]", text, re.DOTALL)
-    if match:
+    # Try each [ ... ] span; prose like "Sources [1]:" can precede the real list
+    for span in _balanced_spans(text, "["):
         try:
-            parsed = json.loads(match.group(0))
-            if isinstance(parsed, list):
-                return parsed
+            parsed = json_loads(span)
         except json.JSONDecodeError:
-            pass
+            continue
+        if isinstance(parsed, list) and parsed and all(isinstance(p, dict) for p in parsed):
+            return parsed
 
     # Try finding multiple { ... } objects
-    objs = re.findall(r"\{.*?\}", text, re.DOTALL)
+    objs = list(_balanced_spans(text, "{"))
     if objs:
         try:
-            return [json.loads(o) for o in objs]
+            return [json_loads(o) for o in objs]
         except json.JSONDecodeError:
             pass
 
@@ -72,16 +232,16 @@ def extract_json_object(text: str) -> Dict[str, Any]:
     text = text.strip()
 
     try:
-        parsed = json.loads(text)
+        parsed = json_loads(text)
         if isinstance(parsed, dict):
             return parsed
     except json.JSONDecodeError:
         pass
 
-    match = re.search(r"\{.*\}", text, re.DOTALL)
-    if match:
+    span = next(_balanced_spans(text, "{"), None)
+    if span:
         try:
-            return json.loads(match.group(0))
+            return json_loads(span)
         except json.JSONDecodeError:
             pass
 
@@ -92,6 +252,28 @@ def extract_json_object(text: str) -> Dict[str, Any]:
 # Web Search & Scraping
 # --------------------------------------------------------------------
 
+MAX_RESPONSE_BYTES = 8 * 1024 * 1024  # 8 MiB cap on streamed API responses
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+def read_capped(resp: requests.Response, max_bytes: int = MAX_RESPONSE_BYTES) -> bytes:
+    """
+    Reads a streamed (`stream=True`) response body in chunks.
+    Raises ValueError as soon as the body grows past `max_bytes`, so a
+    pathological response never gets fully buffered.
+    """
+    declared = resp.headers.get("Content-Length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise ValueError(f"Response from {resp.url} declares {declared} bytes (cap {max_bytes})")
+
+    buf = bytearray()
+    for chunk in resp.iter_content(chunk_size=_READ_CHUNK_SIZE):
+        buf.extend(chunk)
+        if len(buf) > max_bytes:
+            raise ValueError(f"Response from {resp.url} exceeded {max_bytes} bytes")
+    return bytes(buf)
+
+
 def normalize_url(url: str) -> str:
     """Normalizes URLs, handling DuckDuckGo redirects and missing schemes."""
     if not url:
@@ -131,13 +313,14 @@ async def web_search(query: str, num_results: int = 5) -> List[Dict[str, Any]]:
         if not settings.tavily_api_key:
             return None
         try:
-            resp = requests.post(
+            with http_session.post(
                 "https://api.tavily.com/search",
                 json={"api_key": settings.tavily_api_key, "query": query, "num_results": num_results},
                 timeout=10,
-            )
-            resp.raise_for_status()
-            results = resp.json().get("results", [])
+                stream=True,
+            ) as resp:
+                resp.raise_for_status()
+                results = json_loads(read_capped(resp)).get("results", [])
             return [
                 {"title": r.get("title", ""), "url": normalize_url(r.get("url", "")), "content": r.get("content", "")}
                 for r in results
@@ -149,8 +332,9 @@ async def web_search(query: str, num_results: int = 5) -> List[Dict[str, Any]]:
     def _ddg_search():
         try:
             headers = {"User-Agent": "Mozilla/5.0 (compatible; AgenticAI/1.0)"}
-            url = f"https://html.duckduckgo.com/html/?q={query.replace(' ', '+')}"
-            resp = requests.get(url, headers=headers, timeout=10)
+            resp = http_session.get(
+                "https://html.duckduckgo.com/html/", params={"q": query}, headers=headers, timeout=10
+            )
             resp.raise_for_status()
             
             items = []
@@ -197,7 +381,7 @@ async def scrape_url(url: str, max_chars: int = 8000) -> str:
                 "Sec-Fetch-User": "?1",
                 "Cache-Control": "max-age=0",
             }
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = http_session.get(url, headers=headers, timeout=15)
             resp.raise_for_status()
             html = resp.text
             
@@ -6,37 +6,60 @@ Executes the selected research agents in parallel.
 """
 
 import asyncio
-from typing import List
+from typing import Any, Dict, List
 
 from loguru import logger
 
 from graph.state import AgentState
+from core.utils import TTLCache
 from core.tools.competitor_tool import competitor_tool
 from core.tools.trend_scraper_tool import trend_scraper_tool
 from core.tools.paper_miner_tool import paper_miner_tool
 
+# Planner agent name -> tool, resolved once at import
+_AGENT_TOOLS = {
+    "CompetitorScout": competitor_tool,
+    "TrendScraper": trend_scraper_tool,
+    "TechPaperMiner": paper_miner_tool,
+}
+
+# (agent, normalized query) -> tool output. Agents only see the query text, so a
+# repeat query (from /chat or /pipeline/run) reuses their research for an hour
+# unless the run sets `force`.
+_AGENT_RESULTS = TTLCache(maxsize=256, ttl=3600)
+
+
+async def _run_cached(name: str, tool, user_input: str, force: bool = False) -> Dict[str, Any]:
+    key = (name, " ".join(user_input.lower().split()))
+    cached = None if force else _AGENT_RESULTS.get(key)
+    if cached is not None:
+        logger.debug("♻️ [AgentNode] {} cache hit", name)
+        return cached
+
+    output = await tool(user_input)
+    if output.get("result"):  # Don't pin failed/empty runs
+        _AGENT_RESULTS.set(key, output)
+    return output
+
 
 async def agent_node(state: AgentState) -> AgentState:
     """
     Runs agents specified in the plan.
     """
     user_input = state["user_input"]
+    force = bool(state.get("force"))
     plan = state.get("plan", {})
-    suggested_agents = plan.get("suggested_agents", [])
+    # LLM plans name the agents "selected_agents"; the fallback plan uses "suggested_agents"
+    suggested_agents = plan.get("selected_agents") or plan.get("suggested_agents", [])
 
     logger.info(f"🤖 [AgentNode] Executing agents: {suggested_agents}")
 
-    tasks = []
-    if "CompetitorScout" in suggested_agents:
-        tasks.append(competitor_tool(user_input))
-    if "TrendScraper" in suggested_agents:
-        tasks.append(trend_scraper_tool(user_input))
-    if "TechPaperMiner" in suggested_agents:
-        tasks.append(paper_miner_tool(user_input))
+    selected = set(suggested_agents)
+    tasks = [_run_cached(name, tool, user_input, force) for name, tool in _AGENT_TOOLS.items() if name in selected]
 
     if not tasks:
         logger.warning("⚠️ [AgentNode] No agents triggered. Defaulting to TrendScraper.")
-        tasks.append(trend_scraper_tool(user_input))
+        tasks.append(_run_cached("TrendScraper", trend_scraper_tool, user_input, force))
 
     # Run in parallel
     results = await asyncio.gather(*tasks, return_exceptions=True)
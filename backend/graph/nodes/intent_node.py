@@ -6,12 +6,20 @@ First step in the pipeline.
 Parses the user's natural language query into structured intent metadata.
 """
 
+from functools import lru_cache
+
 from loguru import logger
 
 from graph.state import AgentState
 from core.intent_parser import IntentParser
 
 
+@lru_cache(maxsize=1)
+def _parser() -> IntentParser:
+    """Shared parser; keeps its GenAI client (and HTTP connections) warm across requests."""
+    return IntentParser()
+
+
 async def intent_node(state: AgentState) -> AgentState:
     """
     Executes intent parsing.
@@ -19,7 +27,7 @@ async def intent_node(state: AgentState) -> AgentState:
     user_input = state["user_input"]
     logger.info(f"🧠 [IntentNode] Parsing: {user_input}")
 
-    parser = IntentParser()
+    parser = _parser()
     intent = await parser.parse(user_input)
 
     return {
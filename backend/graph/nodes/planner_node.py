@@ -50,7 +50,9 @@ async def planner_node(state: AgentState) -> AgentState:
         response = await llm_generate(prompt, temperature=0.3, max_tokens=1024, api_key=settings.google_key_planner)
         if response.startswith("⚠️"):
             raise ValueError(response)
-        plan = json.loads(response)
+        plan = extract_json_object(response)
+        if not plan:
+            raise ValueError("No JSON object in planner response")
     except Exception as e:
         logger.warning(f"⚠️ [PlannerNode] Planning failed: {e}. Using fallback.")
         plan = _fallback_plan(intent)
@@ -5,6 +5,7 @@ RAG Node
 Indexes agent outputs and retrieves relevant context for the final report.
 """
 
+from functools import lru_cache
 from typing import Any, Dict, List
 
 from loguru import logger
@@ -14,6 +15,11 @@ from core.rag_manager import VectorStoreManager
 from core.types import Document
 
 
+@lru_cache(maxsize=1)
+def _vector_store() -> VectorStoreManager:
+    return VectorStoreManager()
+
+
 async def rag_node(state: AgentState) -> AgentState:
     """
     Indexes agent results and retrieves context.
@@ -40,7 +46,7 @@ async def rag_node(state: AgentState) -> AgentState:
         # Also index raw docs if available (optional, might be too much noise)
         # For now, let's stick to the summary results as they are high-value
 
-    manager = VectorStoreManager()
+    manager = _vector_store()
     
     # Clear previous run's data (ephemeral RAG for this session)
     # In a real app, we might use session IDs
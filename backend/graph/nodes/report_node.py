@@ -6,7 +6,7 @@ Final step in the pipeline.
 Synthesizes all gathered information into a comprehensive Markdown report.
 """
 
-import json
+import asyncio
 from typing import Any, Dict, List
 
 from loguru import logger
@@ -14,9 +14,14 @@ from loguru import logger
 from graph.state import AgentState
 from core.llm import llm_generate
 from core.summarizer import summarize_docs
+from core.utils import json_dumps
 from core.types import Document
 from app.config import settings
 
+# Findings per agent passed to the report prompt; agents return their strongest
+# items first, so the tail mostly adds input tokens rather than new information.
+MAX_FINDINGS_PER_AGENT = 8
+
 
 async def report_node(state: AgentState) -> AgentState:
     """
@@ -29,28 +34,27 @@ async def report_node(state: AgentState) -> AgentState:
 
     logger.info("📝 [ReportNode] Drafting final report...")
 
-    # Prepare Context
-    intent_json = json.dumps(intent, ensure_ascii=False, indent=2)
+    # Prepare Context (compact JSON: indentation only spends input tokens)
+    intent_json = json_dumps(intent)
     
     # Simplify agent outputs for prompt context
     simplified_outputs = []
     for item in agent_outputs:
         # Handle both list of dicts (new agents) and other formats
         summary_data = item.get("output_summary") or item.get("result")
+        if isinstance(summary_data, list):
+            summary_data = summary_data[:MAX_FINDINGS_PER_AGENT]
         simplified_outputs.append({
             "agent": item.get("agent") or item.get("meta", {}).get("agent"),
             "summary": summary_data
         })
-    agent_json = json.dumps(simplified_outputs, ensure_ascii=False, indent=2)
+    agent_json = json_dumps(simplified_outputs)
 
-    # Prepare RAG snippets
-    doc_snippets = []
-    for d in docs[:8]: # Increased context
-        doc_snippets.append({
-            "content": d.page_content[:1500], 
-            "metadata": d.metadata,
-        })
-    docs_json = json.dumps(doc_snippets, ensure_ascii=False, indent=2)
+    # Prepare RAG snippets as plain bullets (the chunk text is what matters, not its metadata)
+    docs_text = "\n".join(
+        f"- [{d.metadata.get('agent', 'source')}] {d.page_content[:1500]}"
+        for d in docs[:8]  # Increased context
+    )
 
     prompt = f"""
     You are an expert **Startup Strategy Consultant** and **Product Analyst**.
@@ -69,7 +73,7 @@ async def report_node(state: AgentState) -> AgentState:
     {agent_json}
     
     ## 3. Retrieved Knowledge (RAG)
-    {docs_json}
+    {docs_text}
     
     # INSTRUCTIONS
     
@@ -104,20 +108,25 @@ async def report_node(state: AgentState) -> AgentState:
     **Format:** Clean Markdown.
     """
 
-    try:
-        final_report = await llm_generate(prompt, temperature=0.4, model="gemini-2.5-flash", max_tokens=4096, api_key=settings.google_key_report)
-    except Exception as e:
-        logger.error(f"❌ [ReportNode] Report generation failed: {e}")
-        final_report = f"# Error Generating Report\n\n{e}"
+    async def _draft_report() -> str:
+        try:
+            return await llm_generate(prompt, temperature=0.4, model="gemini-2.5-flash", max_tokens=4096, api_key=settings.google_key_report)
+        except Exception as e:
+            logger.error(f"❌ [ReportNode] Report generation failed: {e}")
+            return f"# Error Generating Report\n\n{e}"
+
+    async def _summarize() -> str:
+        try:
+            return await summarize_docs(docs)
+        except Exception:
+            return "Summary generation failed."
 
-    # Generate a short summary for the UI
-    try:
-        if docs:
-            summary = await summarize_docs(docs)
-        else:
-            summary = final_report[:500] + "..."
-    except Exception:
-        summary = "Summary generation failed."
+    # The UI summary only depends on the docs, so draft it alongside the report
+    if docs:
+        final_report, summary = await asyncio.gather(_draft_report(), _summarize())
+    else:
+        final_report = await _draft_report()
+        summary = final_report[:500] + "..."
 
     logger.info("✅ [ReportNode] Report generated.")
 
@@ -16,6 +16,7 @@ class AgentState(TypedDict, total=False):
     
     Attributes:
         user_input (str): The original user query.
+        force (bool): Re-run the agents instead of reusing cached results.
         intent (Dict): Parsed intent metadata.
         plan (Dict): The execution plan generated by the planner.
         agent_outputs (List[Dict]): Results from executed agents.
@@ -24,6 +25,7 @@ class AgentState(TypedDict, total=False):
         final_report (str): The final markdown report.
     """
     user_input: str
+    force: bool
     intent: Dict[str, Any]
     plan: Dict[str, Any]
     agent_outputs: List[Dict[str, Any]]
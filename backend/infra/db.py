@@ -7,24 +7,61 @@ Includes automatic schema initialization, migration, and helper functions
 for executing queries.
 
 Key Features:
-- Async connection management with timeouts.
+- Process-wide async connection pool (opened in the app lifespan),
+  with a per-call connection fallback when the pool is not open.
 - Automatic schema migration (pgvector support).
 - Robust error handling (logs errors instead of crashing on optional ops).
 """
 
+import re
 import json
 import asyncio
-from typing import Any, List, Optional, Tuple
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
 
 from loguru import logger
 from psycopg import AsyncConnection
 from psycopg.rows import tuple_row
+from psycopg_pool import AsyncConnectionPool
 from app.config import settings
 
 # Constants
 DATABASE_URL = settings.database_url
 CONNECT_TIMEOUT = 3.0  # seconds
 EMBEDDING_DIM = 768    # text-embedding-004 dimension
+# Stored as half-precision (pgvector >= 0.7): 2 bytes per dimension instead
+# of 4, so the heap, the HNSW index and every distance scan touch half the bytes.
+EMBEDDING_TYPE = "halfvec"
+# Full-precision type, used when the server's pgvector has no halfvec
+FALLBACK_EMBEDDING_TYPE = "vector"
+HALFVEC_MIN_VERSION = (0, 7)
+
+# Pool sizing. Idle connections are recycled well before Neon's ~5 min
+# idle timeout, and each checkout is health-checked, so a connection the
+# server has dropped is replaced instead of handed out.
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 10
+POOL_MAX_IDLE = 240.0  # seconds
+# Server-side prepare a statement once a pooled connection has run it this many
+# times; later executions skip the parse/plan step.
+PREPARE_THRESHOLD = 2
+
+_pool: Optional[AsyncConnectionPool] = None
+# Type of the live document_chunks.embedding column, set by init_schema
+_embedding_type = EMBEDDING_TYPE
+
+
+def embedding_type() -> str:
+    """
+    Returns the pgvector type of `document_chunks.embedding` ("halfvec" or
+    "vector"). Queries must cast parameters to it: there is no operator
+    between the two types.
+    """
+    return _embedding_type
+
+
+def _version_tuple(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version)[:3])
 
 
 async def get_conn() -> AsyncConnection:
@@ -42,8 +79,6 @@ async def get_conn() -> AsyncConnection:
         raise RuntimeError("❌ DATABASE_URL missing from .env")
 
     try:
-        # We do not use pooling here because Neon's idle timeout 
-        # can break long-lived pooled connections.
         conn = await asyncio.wait_for(
             AsyncConnection.connect(DATABASE_URL, autocommit=True),
             timeout=CONNECT_TIMEOUT
@@ -54,6 +89,61 @@ async def get_conn() -> AsyncConnection:
         raise e
 
 
+async def open_pool() -> None:
+    """
+    Opens the process-wide connection pool.
+    Call once at application startup. On failure the pool stays closed
+    and `connection()` falls back to one connection per call.
+    """
+    global _pool
+    if _pool is not None or not DATABASE_URL:
+        return
+
+    pool = AsyncConnectionPool(
+        DATABASE_URL,
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        max_idle=POOL_MAX_IDLE,
+        timeout=CONNECT_TIMEOUT,
+        kwargs={"autocommit": True, "prepare_threshold": PREPARE_THRESHOLD},
+        check=AsyncConnectionPool.check_connection,
+        open=False,
+    )
+    try:
+        await pool.open(wait=True, timeout=CONNECT_TIMEOUT)
+        _pool = pool
+        logger.info("🔌 DB connection pool opened.")
+    except Exception as e:
+        logger.error(f"❌ DB pool open failed: {repr(e)}")
+        await pool.close()
+
+
+async def close_pool() -> None:
+    """Closes the connection pool (application shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+@asynccontextmanager
+async def connection() -> AsyncIterator[AsyncConnection]:
+    """
+    Yields a database connection: borrowed from the pool when it is open,
+    otherwise a fresh connection that is closed on exit.
+    """
+    if _pool is not None:
+        async with _pool.connection() as conn:
+            yield conn
+        return
+
+    conn = await get_conn()
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
 async def is_db_available() -> bool:
     """
     Checks if the database is currently reachable.
@@ -62,9 +152,8 @@ async def is_db_available() -> bool:
         bool: True if connection succeeds, False otherwise.
     """
     try:
-        conn = await get_conn()
-        await conn.close()
-        return True
+        async with connection():
+            return True
     except Exception:
         return False
 
@@ -75,7 +164,9 @@ async def init_schema() -> None:
     
     - Enables `vector` extension.
     - Creates `document_chunks` and `pipeline_results` tables.
-    - Migrates existing columns to the correct embedding dimension.
+    - Migrates existing columns to the correct embedding type + dimension
+      (halfvec, or vector when pgvector is older than 0.7).
+    - Creates an HNSW index on `document_chunks.embedding`.
     
     Note:
         Failures here are logged but do not raise exceptions, allowing
@@ -83,28 +174,54 @@ async def init_schema() -> None:
     """
     # SQL Statements
     enable_vector = "CREATE EXTENSION IF NOT EXISTS vector;"
-    
-    create_chunks_table = f"""
+
+    vector_version = "SELECT extversion FROM pg_extension WHERE extname = 'vector';"
+
+    # Embedding DDL is filled in with the type chosen below: {vtype}({dim})
+    create_chunks_table = """
     CREATE TABLE IF NOT EXISTS document_chunks (
         id SERIAL PRIMARY KEY,
         doc_id TEXT,
         content TEXT,
         metadata JSONB,
-        embedding vector({EMBEDDING_DIM}),
+        embedding {vtype}({dim}),
         created_at TIMESTAMP DEFAULT NOW()
     );
     """
     
     # Ensure embedding column exists
-    add_embedding_col = f"""
+    add_embedding_col = """
     ALTER TABLE document_chunks
-    ADD COLUMN IF NOT EXISTS embedding vector({EMBEDDING_DIM});
+    ADD COLUMN IF NOT EXISTS embedding {vtype}({dim});
     """
     
-    # Migration: Force correct dimension
-    alter_embedding_col = f"""
-    ALTER TABLE document_chunks
-    ALTER COLUMN embedding TYPE vector({EMBEDDING_DIM});
+    # Migration: Force correct type + dimension. Only rewrites when they differ;
+    # the old index's operator class can't follow the type change, so it is
+    # dropped first and recreated below.
+    alter_embedding_col = """
+    DO $$
+    BEGIN
+        IF (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+            WHERE attrelid = 'document_chunks'::regclass AND attname = 'embedding')
+            <> '{vtype}({dim})' THEN
+            DROP INDEX IF EXISTS document_chunks_embedding_hnsw;
+            ALTER TABLE document_chunks
+            ALTER COLUMN embedding TYPE {vtype}({dim})
+            USING embedding::{vtype}({dim});
+        END IF;
+    END $$;
+    """
+
+    embedding_col_type = """
+    SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+    WHERE attrelid = 'document_chunks'::regclass AND attname = 'embedding';
+    """
+
+    # Approximate-NN index for `ORDER BY embedding <=> q LIMIT k` (cosine, as
+    # searched in core.rag_manager); without it every search scans the table.
+    create_embedding_index = """
+    CREATE INDEX IF NOT EXISTS document_chunks_embedding_hnsw
+    ON document_chunks USING hnsw (embedding {vtype}_cosine_ops);
     """
 
     create_results_table = """
@@ -118,22 +235,45 @@ async def init_schema() -> None:
     );
     """
 
+    global _embedding_type
     try:
-        conn = await get_conn()
-        async with conn.cursor() as cur:
+        async with connection() as conn, conn.cursor() as cur:
+            # Independent of pgvector, so results persist even if the chunk DDL fails
+            await cur.execute(create_results_table)
             await cur.execute(enable_vector)
-            await cur.execute(create_chunks_table)
-            await cur.execute(add_embedding_col)
+
+            # halfvec needs pgvector >= 0.7; older servers keep full-precision vectors
+            await cur.execute(vector_version)
+            row = await cur.fetchone()
+            wanted = EMBEDDING_TYPE
+            if not row or _version_tuple(row[0]) < HALFVEC_MIN_VERSION:
+                wanted = FALLBACK_EMBEDDING_TYPE
+                logger.warning(f"⚠️ pgvector {row[0] if row else '?'} has no halfvec; storing embeddings as vector.")
+
+            await cur.execute(create_chunks_table.format(vtype=wanted, dim=EMBEDDING_DIM))
+            await cur.execute(add_embedding_col.format(vtype=wanted, dim=EMBEDDING_DIM))
             
             # Attempt migration (might fail if data is incompatible, so we catch it)
             try:
-                await cur.execute(alter_embedding_col)
+                await cur.execute(alter_embedding_col.format(vtype=wanted, dim=EMBEDDING_DIM))
             except Exception as e:
                 logger.warning(f"⚠️ Could not alter embedding column: {e}")
 
-            await cur.execute(create_results_table)
+            # Queries cast to whatever the column really is, so a failed
+            # migration leaves search on the old type instead of breaking it
+            await cur.execute(embedding_col_type)
+            row = await cur.fetchone()
+            actual = row[0].split("(", 1)[0] if row else wanted
+            _embedding_type = actual if actual in (EMBEDDING_TYPE, FALLBACK_EMBEDDING_TYPE) else wanted
+            if _embedding_type != wanted:
+                logger.warning(f"⚠️ Embedding column is {row[0]}; queries will cast to {_embedding_type}.")
+
+            # HNSW needs pgvector >= 0.5; search still works (sequentially) without it
+            try:
+                await cur.execute(create_embedding_index.format(vtype=_embedding_type))
+            except Exception as e:
+                logger.warning(f"⚠️ Could not create embedding index: {e}")
 
-        await conn.close()
         logger.info("🛠️ Database schema initialized + auto-migrated.")
 
     except Exception as e:
@@ -150,14 +290,30 @@ async def db_execute(sql: str, params: Optional[List[Any]] = None) -> None:
     """
     params = params or []
     try:
-        conn = await get_conn()
-        async with conn.cursor() as cur:
+        async with connection() as conn, conn.cursor() as cur:
             await cur.execute(sql, params)
-        await conn.close()
     except Exception as e:
         logger.error(f"❌ DB execute error: {e}")
         # raise e  <-- Suppressed for graceful degradation
 
+async def db_execute_many(sql: str, params_seq: Sequence[Sequence[Any]]) -> None:
+    """
+    Executes one DML statement for every parameter set, on a single connection.
+    psycopg pipelines executemany, so N rows cost about one round-trip instead of N.
+    
+    Args:
+        sql (str): The SQL query.
+        params_seq (Sequence): One parameter list per execution.
+    """
+    if not params_seq:
+        return
+    try:
+        async with connection() as conn, conn.cursor() as cur:
+            await cur.executemany(sql, params_seq)
+    except Exception as e:
+        logger.error(f"❌ DB executemany error: {e}")
+        # Suppressed for graceful degradation, like db_execute
+
 async def db_query(sql: str, params: Optional[List[Any]] = None) -> List[Tuple]:
     """
     Executes a SELECT statement and returns rows.
@@ -171,17 +327,21 @@ async def db_query(sql: str, params: Optional[List[Any]] = None) -> List[Tuple]:
     """
     params = params or []
     try:
-        conn = await get_conn()
-        async with conn.cursor(row_factory=tuple_row) as cur:
+        async with connection() as conn, conn.cursor(row_factory=tuple_row) as cur:
             await cur.execute(sql, params)
-            rows = await cur.fetchall()
-        await conn.close()
-        return rows
+            return await cur.fetchall()
     except Exception as e:
         logger.error(f"❌ DB query error: {e}")
         return [] # Return empty list on failure
 
 
+_INSERT_RESULT_SQL = """
+INSERT INTO pipeline_results (idea, intent_json, strategy_json, report_md)
+VALUES (%s, %s, %s, %s)
+RETURNING id;
+"""
+
+
 async def save_pipeline_result(idea: str, intent: dict, strategy: dict, report_md: str) -> Optional[int]:
     """
     Saves the full result of a pipeline run.
@@ -195,12 +355,6 @@ async def save_pipeline_result(idea: str, intent: dict, strategy: dict, report_m
     Returns:
         int: The ID of the inserted record, or None if failed.
     """
-    sql = """
-    INSERT INTO pipeline_results (idea, intent_json, strategy_json, report_md)
-    VALUES (%s, %s, %s, %s)
-    RETURNING id;
-    """
-    
     params = [
         idea,
         json.dumps(intent, ensure_ascii=False),
@@ -209,7 +363,7 @@ async def save_pipeline_result(idea: str, intent: dict, strategy: dict, report_m
     ]
 
     try:
-        rows = await db_query(sql, params)
+        rows = await db_query(_INSERT_RESULT_SQL, params)
         return rows[0][0] if rows else None
     except Exception as e:
         logger.error(f"❌ Failed to save pipeline result: {e}")
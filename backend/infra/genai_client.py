@@ -8,20 +8,59 @@ Features:
 - Safe fallbacks for quota exhaustion.
 - Consistent embedding dimensions.
 - Direct API key support.
+- One shared client (and HTTP connection pool) per API key.
+- Native async variants (client.aio): no threadpool hop per call.
+- Process-wide concurrency limit on async calls, held per attempt only
+  (released during retry backoff).
 """
 
+import asyncio
 import os
 import time
+from functools import lru_cache
 from typing import List, Optional
 
 from loguru import logger
-from fastapi.concurrency import run_in_threadpool
 from google import genai
 from google.genai import types
 
 from app.config import settings
 
 
+# Max in-flight Gemini requests per process (see `gemini_slot`)
+_GEMINI_SEM = asyncio.Semaphore(settings.llm_concurrency)
+
+
+def gemini_slot() -> asyncio.Semaphore:
+    """
+    Returns the process-wide Gemini limiter. Hold it around a single request
+    only, never across a backoff sleep: `async with gemini_slot(): await ...`.
+    """
+    return _GEMINI_SEM
+
+
+@lru_cache(maxsize=8)
+def _client_for_key(key: str) -> genai.Client:
+    """Builds the client for `key` once; every later caller reuses it."""
+    return genai.Client(api_key=key)
+
+
+@lru_cache(maxsize=64)
+def _cached_generate_config(**kwargs) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(**kwargs)
+
+
+def _generate_config(kwargs: dict) -> types.GenerateContentConfig:
+    """
+    Returns the GenerateContentConfig for `kwargs`, built (and validated) once
+    per distinct setting; callers reuse a handful of temperature/token combos.
+    """
+    try:
+        return _cached_generate_config(**kwargs)
+    except TypeError:  # Unhashable option value (e.g. a nested config object)
+        return types.GenerateContentConfig(**kwargs)
+
+
 class GenAIClient:
     """
     Enhanced Google GenAI wrapper.
@@ -34,21 +73,39 @@ class GenAIClient:
 
     @staticmethod
     def _make_client(api_key: Optional[str] = None) -> genai.Client:
-        """Creates a GenAI client instance."""
+        """Returns the shared GenAI client for the given (or default) API key."""
         key = api_key or settings.google_api_key
         if not key:
             raise ValueError("No Google API key provided.")
         
         # Set env var for compatibility
         os.environ["GOOGLE_API_KEY"] = key
-        return genai.Client(api_key=key)
+        return _client_for_key(key)
 
     @classmethod
-    def _backoff(cls, attempt: int) -> None:
-        """Sleeps for an exponential backoff duration."""
+    def _backoff_delay(cls, attempt: int) -> float:
         delay = min(cls.INITIAL_BACKOFF * (2 ** attempt), cls.MAX_BACKOFF)
         logger.warning(f"⏳ Backoff {delay:.1f}s before retry...")
-        time.sleep(delay)
+        return delay
+
+    @classmethod
+    def _backoff(cls, attempt: int) -> None:
+        """Sleeps for an exponential backoff duration."""
+        time.sleep(cls._backoff_delay(attempt))
+
+    @classmethod
+    async def _backoff_async(cls, attempt: int) -> None:
+        """Awaits an exponential backoff duration without blocking the event loop."""
+        await asyncio.sleep(cls._backoff_delay(attempt))
+
+    @staticmethod
+    def _response_text(resp) -> str:
+        """Extracts text safely from a generate_content response."""
+        return (
+            getattr(resp, "text", None)
+            or getattr(resp, "content", None)
+            or str(resp)
+        )
 
     @classmethod
     def generate(cls, model: str, prompt: str, api_key: Optional[str] = None, **kwargs) -> str:
@@ -71,16 +128,9 @@ class GenAIClient:
                 resp = client.models.generate_content(
                     model=model,
                     contents=prompt,
-                    config=types.GenerateContentConfig(**kwargs)
-                )
-                
-                # Extract text safely
-                text = (
-                    getattr(resp, "text", None)
-                    or getattr(resp, "content", None)
-                    or str(resp)
+                    config=_generate_config(kwargs)
                 )
-                return text
+                return cls._response_text(resp)
 
             except Exception as e:
                 logger.warning(f"⚠️ LLM error (attempt={attempt+1}): {e}")
@@ -94,8 +144,30 @@ class GenAIClient:
 
     @classmethod
     async def generate_async(cls, model: str, prompt: str, api_key: Optional[str] = None, **kwargs) -> str:
-        """Async wrapper for generate."""
-        return await run_in_threadpool(cls.generate, model, prompt, api_key, **kwargs)
+        """
+        Async version of generate (same retries and fallback), awaited on the shared client.
+        Each attempt holds a `gemini_slot()`; the backoff between attempts does not.
+        """
+        client = cls._make_client(api_key)
+
+        for attempt in range(cls.MAX_RETRIES):
+            try:
+                async with _GEMINI_SEM:
+                    resp = await client.aio.models.generate_content(
+                        model=model,
+                        contents=prompt,
+                        config=_generate_config(kwargs)
+                    )
+                return cls._response_text(resp)
+
+            except Exception as e:
+                logger.warning(f"⚠️ LLM error (attempt={attempt+1}): {e}")
+                if attempt < cls.MAX_RETRIES - 1:
+                    await cls._backoff_async(attempt)
+                else:
+                    logger.error("❌ LLM failed after retries.")
+
+        return "⚠️ LLM Error — Request failed."
 
     @classmethod
     def embed(cls, texts: List[str], model: str = "text-embedding-004", dim: int = 768, task: str = "RETRIEVAL_DOCUMENT", api_key: Optional[str] = None) -> List[List[float]]:
@@ -127,6 +199,33 @@ class GenAIClient:
         return [[] for _ in texts]
 
     @classmethod
-    async def embed_async(cls, texts: List[str], **kwargs) -> List[List[float]]:
-        """Async wrapper for embed."""
-        return await run_in_threadpool(cls.embed, texts, **kwargs)
\ No newline at end of file
+    async def embed_async(cls, texts: List[str], model: str = "text-embedding-004", dim: int = 768, task: str = "RETRIEVAL_DOCUMENT", api_key: Optional[str] = None, max_retries: Optional[int] = None) -> List[List[float]]:
+        """
+        Async version of embed (same retries and fallback), awaited on the shared client.
+        Each attempt holds a `gemini_slot()`; the backoff between attempts does not.
+        `max_retries` overrides MAX_RETRIES (1 = single attempt, for latency-bound lookups).
+        """
+        client = cls._make_client(api_key)
+        attempts = max_retries or cls.MAX_RETRIES
+
+        for attempt in range(attempts):
+            try:
+                async with _GEMINI_SEM:
+                    resp = await client.aio.models.embed_content(
+                        model=model,
+                        contents=texts,
+                        config=types.EmbedContentConfig(
+                            output_dimensionality=dim,
+                            task_type=task,
+                        ),
+                    )
+                return [e.values for e in resp.embeddings]
+
+            except Exception as e:
+                logger.warning(f"⚠️ Embedding error (attempt={attempt+1}): {e}")
+                if attempt < attempts - 1:
+                    await cls._backoff_async(attempt)
+                else:
+                    logger.error("❌ Embedding failed after retries.")
+
+        return [[] for _ in texts]
\ No newline at end of file
@@ -10,14 +10,24 @@ Used for storing:
 - Final markdown reports
 
 This is a simple filesystem-based store, separate from the database.
+Writes are atomic (temp file + rename), so concurrent pipeline runs never
+leave a torn or interleaved file behind; the last completed write wins.
 """
 
+import os
 import json
+import tempfile
+import dataclasses
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 from loguru import logger
 
+try:
+    import orjson  # Optional: several times faster, and encodes straight to bytes
+except ImportError:
+    orjson = None
+
 # Constants
 BASE_DIR = Path("data/memory_store")
 BASE_DIR.mkdir(parents=True, exist_ok=True)
@@ -29,10 +39,53 @@ class CustomEncoder(json.JSONEncoder):
             return obj.dict()
         if hasattr(obj, "to_json"):
             return obj.to_json()
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            # Slotted dataclasses (e.g. core.types.Document) have no __dict__
+            return dataclasses.asdict(obj)
         if hasattr(obj, "__dict__"):
             return obj.__dict__
         return super().default(obj)
 
+
+# orjson takes the same fallback hook (it also signals "unsupported" with TypeError)
+_ENCODER = CustomEncoder()
+
+
+def _dumps(data: Any) -> Union[str, bytes]:
+    """Indented JSON for the store files: orjson bytes when available, else a stdlib str."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=_ENCODER.default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, indent=2, ensure_ascii=False, cls=CustomEncoder)
+
+
+def write_atomic(path: Path, content: Union[str, bytes, Iterable[bytes]]) -> None:
+    """
+    Writes `content` to `path` atomically.
+    Data goes to a temp file in the same directory, then replaces `path` in
+    one rename, so readers see either the old file or the new one.
+    `content` may also be an iterable of byte chunks, written as they are
+    produced, so large payloads never need to exist in memory all at once.
+    """
+    text = isinstance(content, str)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w" if text else "wb", encoding="utf-8" if text else None) as f:
+            if isinstance(content, (str, bytes)):
+                f.write(content)
+            else:
+                for chunk in content:
+                    f.write(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def save_json(name: str, data: Any) -> bool:
     """
     Saves data as a JSON file.
@@ -46,8 +99,7 @@ def save_json(name: str, data: Any) -> bool:
     """
     path = BASE_DIR / f"{name}.json"
     try:
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, cls=CustomEncoder)
+        write_atomic(path, _dumps(data))
         return True
     except Exception as e:
         logger.error(f"❌ Error saving JSON {name}: {e}")
@@ -68,6 +120,8 @@ def load_json(name: str) -> Optional[Any]:
     if not path.exists():
         return None
     try:
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
@@ -88,7 +142,7 @@ def save_text(name: str, content: str) -> bool:
     """
     path = BASE_DIR / f"{name}.md"
     try:
-        path.write_text(content, encoding="utf-8")
+        write_atomic(path, content)
         return True
     except Exception as e:
         logger.error(f"❌ Error saving text {name}: {e}")